@@ -1,11 +1,20 @@
 from pydantic import BaseModel, Field
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
 class AgentConfig(BaseModel):
     name: str
     description: str
     temperature: float = 0.7
     system_prompt: str
+    # Admission control; None falls back to AGENT_MAX_CONCURRENCY / AGENT_MAX_QUEUE_DEPTH
+    max_concurrency: Optional[int] = None
+    max_queue_depth: Optional[int] = None
+    # Complexity score (0-1) at which messages go to the large model; None uses LLM_ROUTING_THRESHOLD
+    routing_threshold: Optional[float] = None
+    # Seconds an LLM call may take, hedges included; None uses LLM_DEADLINE
+    llm_deadline: Optional[float] = None
+    # Capability class names ChatAgent exposes to the LLM as tools
+    tools: Optional[List[str]] = None
 
 class AgentRequest(BaseModel):
     message: str
@@ -19,6 +28,10 @@ class AgentResponse(BaseModel):
     metadata: Dict[str, Any] = {}
 
 class BaseAgent:
+    # Concurrent identical requests share one execution; agents that move
+    # funds or deploy contracts must set this to False
+    coalesce_requests: bool = True
+
     def __init__(self, config: AgentConfig):
         self.config = config
     
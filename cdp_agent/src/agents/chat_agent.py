@@ -1,22 +1,138 @@
+import asyncio
+import os
+import time
+from typing import List, Tuple
 from .base import BaseAgent, AgentConfig, AgentRequest, AgentResponse
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, AIMessage
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from .llm import count_tokens
+from .llm_cache import llm_response_cache
+from .llm_hedge import LLM_DEADLINE, LLMDeadlineExceeded, llm_hedger
+from .memory import conversation_store
+from .prompts import prompt_registry
+from .routing import model_router
+from .streaming import emit_event, is_streaming
+from capabilities.tools import CapabilityToolkit
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
+
+# Model turns that may call tools before the reply must be final
+LLM_MAX_TOOL_ROUNDS = int(os.getenv("LLM_MAX_TOOL_ROUNDS", "3"))
 
 class ChatAgent(BaseAgent):
     def __init__(self, config: AgentConfig):
         super().__init__(config)
-        self.model = ChatOpenAI(
-            model="gpt-3.5-turbo",
-            temperature=config.temperature
-        )
-        self.prompt = ChatPromptTemplate.from_messages([
-            ("system", config.system_prompt),
-            MessagesPlaceholder(variable_name="messages"),
+        self.compiled_prompt = prompt_registry.get(config)
+        self.prompt = self.compiled_prompt.template
+        # One model per tier; composed once, every request reuses them
+        self.models = {tier: model_router.model(tier, config.temperature) for tier in model_router.tiers}
+        # Summaries are simple; they always use the fast tier
+        self.model = self.models["fast"]
+        self.toolkit = CapabilityToolkit(config.tools) if config.tools else None
+        if self.toolkit:
+            # Once the tool rounds run out, tool_choice="none" forces a final answer
+            self.answer_chains = {
+                tier: self.prompt | model.bind_tools(self.toolkit.definitions, tool_choice="none")
+                for tier, model in self.models.items()
+            }
+            self.models = {
+                tier: model.bind_tools(self.toolkit.definitions, parallel_tool_calls=True)
+                for tier, model in self.models.items()
+            }
+            if not self.toolkit.read_only:
+                self.coalesce_requests = False
+        self.chains = {tier: self.prompt | model for tier, model in self.models.items()}
+
+    def _memory_key(self, thread_id: str) -> str:
+        return f"{self.config.name}:{thread_id}"
+
+    async def _build_messages(self, request: AgentRequest, thread_id: str) -> List[BaseMessage]:
+        """Summary of earlier turns, the recent window, then the new message"""
+        summary, history = await conversation_store.window(self._memory_key(thread_id))
+        messages: List[BaseMessage] = []
+        if summary:
+            messages.append(SystemMessage(content=f"Summary of the earlier conversation:\n{summary}"))
+        for role, content in history:
+            messages.append(HumanMessage(content=content) if role == "human" else AIMessage(content=content))
+        messages.append(HumanMessage(content=request.message))
+        return messages
+
+    async def _summarize(self, previous_summary: str, turns: List[Tuple[str, str]]) -> str:
+        """Fold older turns into the running conversation summary"""
+        transcript = "\n".join(f"{'User' if role == 'human' else 'Assistant'}: {content}" for role, content in turns)
+        response = await self.model.ainvoke([
+            SystemMessage(content="Summarise the conversation concisely, keeping facts, numbers and decisions."),
+            HumanMessage(content=f"Previous summary:\n{previous_summary or '(none)'}\n\nNew turns:\n{transcript}")
         ])
+        return response.content
+
+    async def _remember(self, thread_id: str, request: AgentRequest, content: str):
+        key = self._memory_key(thread_id)
+        await conversation_store.append(key, [("human", request.message), ("ai", content)])
+        conversation_store.schedule_summary(key, self._summarize)
+
+    async def _invoke_model(self, tier: str, messages: List[BaseMessage], allow_tools: bool = True) -> AIMessage:
+        """One hedged, deadline-bound call to the tier's model"""
+        chain = self.chains[tier] if allow_tools or not self.toolkit else self.answer_chains[tier]
+        return await llm_hedger.call(
+            model_router.tiers[tier].model,
+            lambda: chain.ainvoke({"messages": messages}),
+            self.config.llm_deadline
+        )
+
+    async def _run_with_tools(self, tier: str, messages: List[BaseMessage], thread_id: str) -> str:
+        """Let the model call tools, all of a turn's calls concurrently, until it answers.
+
+        After LLM_MAX_TOOL_ROUNDS rounds of tool calls the model is asked once
+        more with tools disabled, so it answers from the results it has.
+        """
+        messages = list(messages)
+        for _ in range(LLM_MAX_TOOL_ROUNDS):
+            response = await self._invoke_model(tier, messages)
+            if not response.tool_calls:
+                return response.content
+            messages.append(response)
+            messages.extend(await self.toolkit.run(response.tool_calls, self.config.name, thread_id))
+        response = await self._invoke_model(tier, messages, allow_tools=False)
+        return response.content or "I couldn't finish that request within the tool call limit."
 
     async def process(self, request: AgentRequest, thread_id: str) -> AgentResponse:
-        messages = [HumanMessage(content=request.message)]
-        chain = self.prompt | self.model
-        response = chain.invoke({"messages": messages})
-        return AgentResponse(content=response.content)
\ No newline at end of file
+        messages = await self._build_messages(request, thread_id)
+        # Only context-free turns (nothing earlier in the thread) are cacheable;
+        # a reply to "yes" or "why?" depends on the conversation, and one
+        # built from tool results depends on live data
+        cacheable = len(messages) == 1 and not self.toolkit
+        cache_key = llm_response_cache.key(self.config, request.message) if cacheable else None
+        cached = llm_response_cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            if is_streaming():
+                emit_event("token", {"content": cached})
+            await self._remember(thread_id, request, cached)
+            return AgentResponse(content=cached, metadata={"cached": True})
+
+        prompt_tokens = self.compiled_prompt.record(messages)
+        tier = model_router.route(self.config, request.message)
+        inputs = {"messages": messages}
+        started = time.perf_counter()
+        if self.toolkit:
+            content = await self._run_with_tools(tier, messages, thread_id)
+            if is_streaming():
+                emit_event("token", {"content": content})
+        elif is_streaming():
+            # Forward tokens to the client as the model produces them
+            # Tokens already sent cannot be hedged, so streams only get the deadline
+            deadline = self.config.llm_deadline if self.config.llm_deadline is not None else LLM_DEADLINE
+            content = ""
+            try:
+                async with asyncio.timeout(deadline):
+                    async for chunk in self.chains[tier].astream(inputs):
+                        if chunk.content:
+                            content += chunk.content
+                            emit_event("token", {"content": chunk.content})
+            except TimeoutError:
+                raise LLMDeadlineExceeded(deadline)
+        else:
+            response = await self._invoke_model(tier, messages)
+            content = response.content
+        model_router.record(tier, (time.perf_counter() - started) * 1000, prompt_tokens + count_tokens(content))
+        if cache_key:
+            llm_response_cache.set(cache_key, content)
+        await self._remember(thread_id, request, content)
+        return AgentResponse(content=content, metadata={"model_tier": tier})
\ No newline at end of file
@@ -23,6 +23,7 @@ class DegenMixin(CDPAgentMixin):
 
 class DegenTrader(BaseAgent, DegenMixin):
     """Degen trader agent that suggests high-risk, high-reward opportunities"""
+    coalesce_requests = False  # executes trades
     
     def __init__(self, config: AgentConfig):
         BaseAgent.__init__(self, config)
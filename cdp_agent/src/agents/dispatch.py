@@ -0,0 +1,132 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
+from agents.base import BaseAgent, AgentRequest, AgentResponse
+from agents.registry import AgentRegistry, AgentNotFoundError
+from capabilities.prefetch import prefetch_capabilities
+from utils.admission import AdmissionController, Overloaded
+from utils.keyed_lock import KeyedLock
+from utils.metrics import metrics
+from utils.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on concurrently running items of one batch
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+# Per-agent defaults for requests running at once and requests waiting for a slot
+AGENT_MAX_CONCURRENCY = int(os.getenv("AGENT_MAX_CONCURRENCY", "16"))
+AGENT_MAX_QUEUE_DEPTH = int(os.getenv("AGENT_MAX_QUEUE_DEPTH", "64"))
+
+# Joins concurrent identical (agent_id, thread_id, message) requests
+request_coalescer = SingleFlight()
+metrics.register("request_coalescing", request_coalescer.snapshot)
+
+# Serializes requests per (agent_id, thread_id); that pair owns one wallet
+thread_locks = KeyedLock()
+metrics.register("thread_ordering", thread_locks.snapshot)
+
+# One bounded work queue per agent id
+admission_controllers: Dict[str, AdmissionController] = {}
+metrics.register("admission", lambda: {
+    agent_id: controller.snapshot() for agent_id, controller in admission_controllers.items()
+})
+
+def get_admission_controller(agent: BaseAgent, agent_id: str) -> AdmissionController:
+    controller = admission_controllers.get(agent_id)
+    if controller is None:
+        controller = admission_controllers[agent_id] = AdmissionController(
+            agent_id,
+            agent.config.max_concurrency or AGENT_MAX_CONCURRENCY,
+            agent.config.max_queue_depth if agent.config.max_queue_depth is not None else AGENT_MAX_QUEUE_DEPTH
+        )
+    return controller
+
+class BatchItem(BaseModel):
+    agent_id: str
+    thread_id: str
+    message: str
+    from_user: str = Field(..., alias="from")
+
+    class Config:
+        populate_by_name = True
+
+class BatchRequest(BaseModel):
+    items: List[BatchItem]
+    concurrency: Optional[int] = None
+
+class BatchItemResult(BaseModel):
+    agent_id: str
+    thread_id: str
+    status: str
+    response: Optional[AgentResponse] = None
+    error: Optional[str] = None
+    retry_after: Optional[int] = None
+    latency_ms: float
+
+class BatchResponse(BaseModel):
+    results: List[BatchItemResult]
+
+async def execute_agent_request(agent: BaseAgent, agent_id: str, thread_id: str,
+                                request: AgentRequest) -> AgentResponse:
+    """Run agent.process once admitted to the agent's work queue and after
+    earlier requests on the same agent thread have finished. Price and
+    balance lookups for assets the message mentions start alongside it.
+
+    Raises Overloaded when the agent's queue is full.
+    """
+    async with get_admission_controller(agent, agent_id).admit():
+        async with thread_locks.acquire((agent_id, thread_id)):
+            with prefetch_capabilities(agent, thread_id, request.message):
+                return await agent.process(request, thread_id)
+
+async def run_agent_request(registry: AgentRegistry, agent_id: str, thread_id: str,
+                            request: AgentRequest) -> AgentResponse:
+    """Single entry point for running one request against one agent"""
+    agent = await registry.aget(agent_id)
+    if agent.coalesce_requests:
+        return await request_coalescer.do(
+            (agent_id, thread_id, request.message),
+            lambda: execute_agent_request(agent, agent_id, thread_id, request)
+        )
+    return await execute_agent_request(agent, agent_id, thread_id, request)
+
+async def run_item(registry: AgentRegistry, agent_id: str, thread_id: str,
+                   request: AgentRequest) -> BatchItemResult:
+    """Run one request, capturing its outcome and latency instead of raising"""
+    started = time.perf_counter()
+    retry_after = None
+    try:
+        response = await run_agent_request(registry, agent_id, thread_id, request)
+        status, error = "success", None
+    except Overloaded as e:
+        response, status, error, retry_after = None, "rejected", str(e), e.retry_after
+    except AgentNotFoundError:
+        response, status, error = None, "error", f"Agent '{agent_id}' not found"
+    except Exception as e:
+        logger.error(f"Request to {agent_id} failed: {e}")
+        response, status, error = None, "error", str(e)
+    return BatchItemResult(
+        agent_id=agent_id,
+        thread_id=thread_id,
+        status=status,
+        response=response,
+        error=error,
+        retry_after=retry_after,
+        latency_ms=round((time.perf_counter() - started) * 1000, 1)
+    )
+
+async def run_batch(registry: AgentRegistry, items: List[BatchItem],
+                    concurrency: Optional[int] = None) -> List[BatchItemResult]:
+    """Run all items concurrently (at most `concurrency` at a time), results in input order"""
+    limit = min(concurrency or BATCH_CONCURRENCY, BATCH_CONCURRENCY)
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def run_limited(item: BatchItem) -> BatchItemResult:
+        async with semaphore:
+            request = AgentRequest(message=item.message, from_user=item.from_user)
+            return await run_item(registry, item.agent_id, item.thread_id, request)
+
+    return await asyncio.gather(*(run_limited(item) for item in items))
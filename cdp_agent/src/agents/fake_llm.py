@@ -0,0 +1,93 @@
+import asyncio
+import math
+import os
+import random
+import threading
+import time
+from typing import Any, AsyncIterator, Iterator, List, Optional
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+# Median time to first token and the spread of the lognormal around it
+FAKE_LLM_LATENCY_MS = float(os.getenv("FAKE_LLM_LATENCY_MS", "300"))
+FAKE_LLM_LATENCY_SIGMA = float(os.getenv("FAKE_LLM_LATENCY_SIGMA", "0.5"))
+# Output tokens per second once generation starts; 0 streams instantly
+FAKE_LLM_TOKENS_PER_SEC = float(os.getenv("FAKE_LLM_TOKENS_PER_SEC", "50"))
+# "echo" repeats the last user message, "canned" always answers FAKE_LLM_RESPONSE
+FAKE_LLM_MODE = os.getenv("FAKE_LLM_MODE", "echo")
+FAKE_LLM_RESPONSE = os.getenv("FAKE_LLM_RESPONSE", "This is a canned response from the local test model.")
+FAKE_LLM_SEED = int(os.getenv("FAKE_LLM_SEED", "0"))
+
+class FakeChatModel(BaseChatModel):
+    """Deterministic local stand-in for ChatOpenAI, for offline load testing.
+
+    Latency is drawn from a seeded lognormal distribution, so a run with the
+    same seed and request order sees the same latencies. Output is generated
+    word by word at a fixed token rate.
+    """
+
+    temperature: float = 0.0
+    latency_ms: float = FAKE_LLM_LATENCY_MS
+    latency_sigma: float = FAKE_LLM_LATENCY_SIGMA
+    tokens_per_sec: float = FAKE_LLM_TOKENS_PER_SEC
+    mode: str = FAKE_LLM_MODE
+    response: str = FAKE_LLM_RESPONSE
+    seed: int = FAKE_LLM_SEED
+
+    def model_post_init(self, __context: Any):
+        self._rng = random.Random(self.seed)
+        self._rng_lock = threading.Lock()
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "FakeChatModel":
+        """Accepts tools so tool-enabled agents can be load tested; never calls them"""
+        return self
+
+    def _first_token_delay(self) -> float:
+        with self._rng_lock:
+            return self._rng.lognormvariate(math.log(self.latency_ms / 1000), self.latency_sigma)
+
+    def _reply(self, messages: List[BaseMessage]) -> str:
+        if self.mode == "canned":
+            return self.response
+        last = next((m.content for m in reversed(messages) if isinstance(m, HumanMessage)), "")
+        return f"Echo: {last}"
+
+    def _words(self, text: str) -> List[str]:
+        words = text.split(" ")
+        return [word if i == len(words) - 1 else word + " " for i, word in enumerate(words)]
+
+    def _token_delay(self) -> float:
+        return 1 / self.tokens_per_sec if self.tokens_per_sec > 0 else 0
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        content = "".join(chunk.message.content for chunk in self._stream(messages, stop, run_manager, **kwargs))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Optional[AsyncCallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        content = "".join([chunk.message.content async for chunk in self._astream(messages, stop, run_manager, **kwargs)])
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        time.sleep(self._first_token_delay())
+        for i, word in enumerate(self._words(self._reply(messages))):
+            if i:
+                time.sleep(self._token_delay())
+            yield ChatGenerationChunk(message=AIMessageChunk(content=word))
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+                       **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        await asyncio.sleep(self._first_token_delay())
+        for i, word in enumerate(self._words(self._reply(messages))):
+            if i:
+                await asyncio.sleep(self._token_delay())
+            yield ChatGenerationChunk(message=AIMessageChunk(content=word))
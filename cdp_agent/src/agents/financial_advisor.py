@@ -8,6 +8,23 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Intent keywords, checked in order; the model router reads these too
+INTENT_KEYWORDS = {
+    "market_analysis": ['price', 'worth', 'value', 'cost', 'market'],
+    "trade_suggestion": ['trade', 'swap', 'exchange', 'convert'],
+    "yield_analysis": ['yield', 'earn', 'apy', 'farm', 'interest'],
+    "risk_assessment": ['risk', 'safe', 'protect', 'secure', 'worried'],
+    "general_advice": ['what', 'suggest', 'recommend', 'should', 'advice']
+}
+
+INTENT_CONTEXTS = {
+    "market_analysis": "price_focused",
+    "trade_suggestion": "trading",
+    "yield_analysis": "yield_focused",
+    "risk_assessment": "risk_focused",
+    "general_advice": "advisory"
+}
+
 class FinancialAdvisorMixin(CDPAgentMixin):
     """Mixin for Financial Advisor capabilities"""
     def __init__(self):
@@ -104,40 +121,13 @@ class FinancialAdvisor(BaseAgent, FinancialAdvisorMixin):
             mentioned_assets = ['ETH', 'BTC']
 
         # Intent classification
-        if any(word in message for word in ['price', 'worth', 'value', 'cost', 'market']):
-            return {
-                "intent": "market_analysis",
-                "assets": mentioned_assets,
-                "context": "price_focused"
-            }
-            
-        if any(word in message for word in ['trade', 'swap', 'exchange', 'convert']):
-            return {
-                "intent": "trade_suggestion",
-                "assets": mentioned_assets,
-                "context": "trading"
-            }
-            
-        if any(word in message for word in ['yield', 'earn', 'apy', 'farm', 'interest']):
-            return {
-                "intent": "yield_analysis",
-                "assets": mentioned_assets,
-                "context": "yield_focused"
-            }
-            
-        if any(word in message for word in ['risk', 'safe', 'protect', 'secure', 'worried']):
-            return {
-                "intent": "risk_assessment",
-                "assets": mentioned_assets,
-                "context": "risk_focused"
-            }
-            
-        if any(word in message for word in ['what', 'suggest', 'recommend', 'should', 'advice']):
-            return {
-                "intent": "general_advice",
-                "assets": mentioned_assets,
-                "context": "advisory"
-            }
+        for intent, keywords in INTENT_KEYWORDS.items():
+            if any(word in message for word in keywords):
+                return {
+                    "intent": intent,
+                    "assets": mentioned_assets,
+                    "context": INTENT_CONTEXTS[intent]
+                }
 
         return {
             "intent": "market_update",
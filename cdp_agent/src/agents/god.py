@@ -22,6 +22,17 @@ from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Intent keywords, checked in order; the model router reads these too
+INTENT_KEYWORDS = {
+    "market_analysis": ['price', 'worth', 'value', 'market'],
+    "trading": ['trade', 'swap', 'exchange'],
+    "token_deployment": ['deploy', 'create token', 'new token', 'launch'],
+    "yield_farming": ['yield', 'earn', 'apy', 'farm'],
+    # "sentiment": ['sentiment', 'feeling', 'community'],
+    "portfolio": ['portfolio', 'holdings', 'balance'],
+    "governance": ['governance', 'vote', 'proposal']
+}
+
 class GodAgentMixin(CDPAgentMixin):
     """Mixin combining all agent capabilities"""
     def __init__(self):
@@ -42,6 +53,7 @@ class GodAgentMixin(CDPAgentMixin):
 
 class GodAgent(BaseAgent, GodAgentMixin):
     """Unified agent combining all specialized agent capabilities"""
+    coalesce_requests = False  # deploys tokens
     
     def __init__(self, config: AgentConfig):
         BaseAgent.__init__(self, config)
@@ -207,17 +219,7 @@ class GodAgent(BaseAgent, GodAgentMixin):
             assets = ['ETH', 'BTC']
 
         # Determine primary intent
-        intents = {
-            "market_analysis": ['price', 'worth', 'value', 'market'],
-            "trading": ['trade', 'swap', 'exchange'],
-            "token_deployment": ['deploy', 'create token', 'new token', 'launch'],
-            "yield_farming": ['yield', 'earn', 'apy', 'farm'],
-            # "sentiment": ['sentiment', 'feeling', 'community'],
-            "portfolio": ['portfolio', 'holdings', 'balance'],
-            "governance": ['governance', 'vote', 'proposal']
-        }
-
-        for intent, keywords in intents.items():
+        for intent, keywords in INTENT_KEYWORDS.items():
             if any(word in message for word in keywords):
                 return {
                     "intent": intent,
@@ -0,0 +1,83 @@
+import logging
+import os
+import threading
+from typing import Dict, Optional, Tuple
+import httpx
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_openai import ChatOpenAI
+
+logger = logging.getLogger(__name__)
+
+LLM_MODEL = os.getenv("LLM_MODEL", "gpt-3.5-turbo")
+# Connection pool shared by every ChatAgent
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "100"))
+LLM_MAX_KEEPALIVE = int(os.getenv("LLM_MAX_KEEPALIVE", "20"))
+LLM_REQUEST_TIMEOUT = float(os.getenv("LLM_REQUEST_TIMEOUT", "60"))
+
+_http_async_client: Optional[httpx.AsyncClient] = None
+_models: Dict[Tuple[str, float], BaseChatModel] = {}
+_lock = threading.Lock()
+# tiktoken encoding; False once loading it has failed (it is downloaded on first use)
+_encoding = None
+
+def get_http_async_client() -> httpx.AsyncClient:
+    """Process-wide pooled HTTP client for OpenAI calls"""
+    global _http_async_client
+    if _http_async_client is None:
+        _http_async_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=LLM_MAX_KEEPALIVE
+            ),
+            timeout=LLM_REQUEST_TIMEOUT
+        )
+    return _http_async_client
+
+def llm_backend() -> str:
+    """Model backend: "openai" (default) or "fake", the local stand-in for load testing.
+
+    Read at call time so LLM_BACKEND can come from .env.
+    """
+    return os.getenv("LLM_BACKEND", "openai")
+
+def _build_chat_model(temperature: float, model: str) -> BaseChatModel:
+    backend = llm_backend()
+    if backend == "fake":
+        from agents.fake_llm import FakeChatModel
+        return FakeChatModel(temperature=temperature)
+    if backend != "openai":
+        raise ValueError(f"Unknown LLM_BACKEND: {backend}")
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        http_async_client=get_http_async_client()
+    )
+
+def get_chat_model(temperature: float, model: str = LLM_MODEL) -> BaseChatModel:
+    """Shared chat model per (model, temperature), all on the pooled client"""
+    key = (model, temperature)
+    chat_model = _models.get(key)
+    if chat_model is None:
+        with _lock:
+            chat_model = _models.get(key)
+            if chat_model is None:
+                chat_model = _models[key] = _build_chat_model(temperature, model)
+    return chat_model
+
+def count_tokens(text: str) -> int:
+    """Token count used for prompt budgeting.
+
+    Uses tiktoken's cl100k_base encoding and falls back to ~4 characters
+    per token when the encoding is not available offline.
+    """
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            logger.warning(f"tiktoken unavailable, estimating token counts: {e}")
+            _encoding = False
+    if _encoding:
+        return len(_encoding.encode(text))
+    return max(1, len(text) // 4)
@@ -0,0 +1,52 @@
+import hashlib
+import os
+import re
+from typing import Any, Dict, Optional, Tuple
+from agents.base import AgentConfig
+from utils.cache import TTLCache
+from utils.metrics import metrics
+
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "1024"))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "3600"))
+# Above this temperature replies are meant to vary, so the cache is bypassed
+LLM_CACHE_MAX_TEMPERATURE = float(os.getenv("LLM_CACHE_MAX_TEMPERATURE", "0.5"))
+
+class LLMResponseCache:
+    """Caches ChatAgent replies by system prompt, temperature and normalised message"""
+
+    def __init__(self, max_size: int = LLM_CACHE_SIZE, ttl: float = LLM_CACHE_TTL,
+                 max_temperature: float = LLM_CACHE_MAX_TEMPERATURE):
+        self.cache = TTLCache(max_size, ttl)
+        self.max_temperature = max_temperature
+        self.bypassed = 0
+        self._prompt_hashes: Dict[str, str] = {}
+
+    @staticmethod
+    def normalize(message: str) -> str:
+        """Case, whitespace and trailing punctuation do not change the question"""
+        return re.sub(r"\s+", " ", message.strip().lower()).rstrip("?!. ")
+
+    def _prompt_hash(self, system_prompt: str) -> str:
+        prompt_hash = self._prompt_hashes.get(system_prompt)
+        if prompt_hash is None:
+            prompt_hash = self._prompt_hashes[system_prompt] = hashlib.sha256(system_prompt.encode()).hexdigest()
+        return prompt_hash
+
+    def key(self, config: AgentConfig, message: str) -> Optional[Tuple[str, float, str]]:
+        """Cache key for this request, or None when caching is bypassed"""
+        if config.temperature > self.max_temperature:
+            self.bypassed += 1
+            return None
+        return (self._prompt_hash(config.system_prompt), config.temperature, self.normalize(message))
+
+    def get(self, key: Tuple[str, float, str]) -> Optional[str]:
+        return self.cache.get(key)
+
+    def set(self, key: Tuple[str, float, str], content: str):
+        self.cache.set(key, content)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {**self.cache.snapshot(), "bypassed": self.bypassed, "max_temperature": self.max_temperature}
+
+llm_response_cache = LLMResponseCache()
+metrics.register("llm_response_cache", llm_response_cache.snapshot)
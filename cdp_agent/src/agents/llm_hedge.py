@@ -0,0 +1,127 @@
+import asyncio
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+from utils.metrics import LatencyTracker, metrics
+
+# Default per-call deadline in seconds; AgentConfig.llm_deadline overrides it
+LLM_DEADLINE = float(os.getenv("LLM_DEADLINE", "30"))
+# A duplicate call is sent once the first has run longer than this percentile
+# of recent call latencies; 0 disables hedging
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+# Calls observed before hedging starts, so the percentile means something
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+
+class LLMDeadlineExceeded(TimeoutError):
+    """Raised when an LLM call (with any hedge) does not finish within its deadline"""
+
+    def __init__(self, deadline: float):
+        super().__init__(f"LLM call did not finish within {deadline:g}s")
+        self.deadline = deadline
+
+class HedgedCaller:
+    """Runs LLM calls with a deadline and a hedged duplicate for slow ones.
+
+    When a call outlives the hedge percentile of recent latencies a second,
+    identical call is sent; the first to succeed wins and the other is
+    cancelled. `primary` tracks how long the original attempts took, which
+    is what callers would have waited without hedging (a lower bound when
+    a hedge beat them and they were cancelled); `observed` is what callers
+    actually waited.
+    """
+
+    def __init__(self, percentile: float = LLM_HEDGE_PERCENTILE, min_samples: int = LLM_HEDGE_MIN_SAMPLES):
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.attempts = LatencyTracker()
+        self.primary = LatencyTracker()
+        self.observed = LatencyTracker()
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.deadline_exceeded = 0
+
+    def _hedge_after(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None when not hedging"""
+        if self.percentile <= 0 or self.attempts.count < self.min_samples:
+            return None
+        return self.attempts.percentile(self.percentile) / 1000
+
+    async def _attempt(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        started = time.perf_counter()
+        result = await fn()
+        self.attempts.record((time.perf_counter() - started) * 1000)
+        return result
+
+    async def _race(self, fn: Callable[[], Awaitable[Any]], started: float) -> Any:
+        primary = asyncio.ensure_future(self._attempt(fn))
+        primary_done = []
+        primary.add_done_callback(lambda _: primary_done.append(time.perf_counter()))
+        tasks = {primary}
+        try:
+            hedge_after = self._hedge_after()
+            if hedge_after is not None:
+                done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+                if not done:
+                    self.hedged += 1
+                    tasks.add(asyncio.ensure_future(self._attempt(fn)))
+
+            while True:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    tasks.discard(task)
+                    # A failed attempt only fails the call if nothing else is still running
+                    if task.exception() is None or not tasks:
+                        if task is not primary:
+                            self.hedge_wins += 1
+                        return task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+            self.primary.record(((primary_done[0] if primary_done else time.perf_counter()) - started) * 1000)
+
+    async def call(self, fn: Callable[[], Awaitable[Any]], deadline: Optional[float] = None) -> Any:
+        """Await fn() hedged, failing with LLMDeadlineExceeded after `deadline` seconds"""
+        deadline = deadline if deadline is not None else LLM_DEADLINE
+        self.calls += 1
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(self._race(fn, started), deadline)
+        except asyncio.TimeoutError:
+            self.deadline_exceeded += 1
+            raise LLMDeadlineExceeded(deadline)
+        self.observed.record((time.perf_counter() - started) * 1000)
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "hedge_rate": round(self.hedged / self.calls, 3) if self.calls else None,
+            "hedge_wins": self.hedge_wins,
+            "deadline_exceeded": self.deadline_exceeded,
+            "hedge_after_ms": round(self._hedge_after() * 1000, 2) if self._hedge_after() is not None else None,
+            "primary_latency": self.primary.snapshot(),
+            "observed_latency": self.observed.snapshot()
+        }
+
+class LLMHedger:
+    """One HedgedCaller per model, since each model has its own latency profile"""
+
+    def __init__(self):
+        self._callers: Dict[str, HedgedCaller] = {}
+
+    def caller(self, model: str) -> HedgedCaller:
+        caller = self._callers.get(model)
+        if caller is None:
+            caller = self._callers[model] = HedgedCaller()
+        return caller
+
+    async def call(self, model: str, fn: Callable[[], Awaitable[Any]], deadline: Optional[float] = None) -> Any:
+        return await self.caller(model).call(fn, deadline)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {model: caller.snapshot() for model, caller in self._callers.items()}
+
+llm_hedger = LLMHedger()
+metrics.register("llm_hedging", llm_hedger.snapshot)
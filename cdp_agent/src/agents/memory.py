@@ -0,0 +1,175 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from agents.llm import count_tokens
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+MEMORY_DIR = os.getenv("MEMORY_DIR", "data/conversations")
+# Threads kept in memory; older ones are reloaded from disk on demand
+MEMORY_MAX_THREADS = int(os.getenv("MEMORY_MAX_THREADS", "1000"))
+# Tokens of verbatim history sent with each prompt
+MEMORY_TOKEN_BUDGET = int(os.getenv("MEMORY_TOKEN_BUDGET", "1500"))
+# Tokens of turns that fell out of the window before they are summarised
+MEMORY_SUMMARY_THRESHOLD = int(os.getenv("MEMORY_SUMMARY_THRESHOLD", "500"))
+
+class ThreadMemory:
+    """The not-yet-summarised turns of one conversation plus a running summary.
+
+    Turns the summary covers are dropped, so `turns[0]` is turn number
+    `summarized_upto` of the whole conversation.
+    """
+
+    def __init__(self):
+        self.turns: List[Tuple[str, str, int]] = []  # (role, content, tokens)
+        self.summary: str = ""
+        self.summarized_upto = 0  # turns of the conversation covered by summary
+
+    def window_start(self, budget: int) -> int:
+        """Index into turns of the oldest turn that still fits in the token budget"""
+        used = 0
+        start = len(self.turns)
+        while start > 0 and used + self.turns[start - 1][2] <= budget:
+            start -= 1
+            used += self.turns[start][2]
+        return start
+
+class ConversationStore:
+    """Per-thread conversation memory.
+
+    Recent threads live in an LRU-bounded in-memory tier; every thread is
+    also written to an append-only JSONL file so it survives eviction and
+    restarts. Prompts get the summary plus every turn it does not cover
+    yet. Once the turns outside the token budget reach the summary
+    threshold, they are folded into the summary in the background and
+    dropped from memory. File reads and writes run in worker threads, off
+    the event loop.
+    """
+
+    def __init__(self, directory: str = MEMORY_DIR, max_threads: int = MEMORY_MAX_THREADS,
+                 token_budget: int = MEMORY_TOKEN_BUDGET,
+                 summary_threshold: int = MEMORY_SUMMARY_THRESHOLD):
+        self.directory = directory
+        self.max_threads = max_threads
+        self.token_budget = token_budget
+        self.summary_threshold = summary_threshold
+        self._threads: "OrderedDict[str, ThreadMemory]" = OrderedDict()
+        self._summarizing: Dict[str, asyncio.Task] = {}
+        self.loads = 0
+        self.evictions = 0
+        self.summaries = 0
+        self._write_lock = threading.Lock()
+        self._directory_ready = False
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest() + ".jsonl")
+
+    def _append_records(self, key: str, records: List[Dict[str, Any]]):
+        # Serialized so records written from different threads never interleave
+        with self._write_lock:
+            if not self._directory_ready:
+                os.makedirs(self.directory, exist_ok=True)
+                self._directory_ready = True
+            with open(self._path(key), 'a') as f:
+                f.write("".join(json.dumps(record) + "\n" for record in records))
+
+    def _load(self, key: str) -> ThreadMemory:
+        memory = ThreadMemory()
+        path = self._path(key)
+        if not os.path.exists(path):
+            return memory
+        self.loads += 1
+        turns = []
+        with open(path, 'r') as f:
+            for line in f:
+                record = json.loads(line)
+                if record["type"] == "turn":
+                    turns.append((record["role"], record["content"]))
+                elif record["type"] == "summary":
+                    memory.summary = record["content"]
+                    memory.summarized_upto = record["upto"]
+        # Only turns the summary does not cover are kept (and tokenized)
+        memory.turns = [(role, content, count_tokens(content)) for role, content in turns[memory.summarized_upto:]]
+        return memory
+
+    async def get(self, key: str) -> ThreadMemory:
+        memory = self._threads.get(key)
+        if memory is not None:
+            self._threads.move_to_end(key)
+            return memory
+        loaded = await asyncio.to_thread(self._load, key)
+        # Another request may have loaded the thread while this one was reading
+        memory = self._threads.setdefault(key, loaded)
+        self._threads.move_to_end(key)
+        while len(self._threads) > self.max_threads:
+            self._threads.popitem(last=False)
+            self.evictions += 1
+        return memory
+
+    async def window(self, key: str) -> Tuple[str, List[Tuple[str, str]]]:
+        """Summary of older turns and the (role, content) turns it does not cover yet.
+
+        Turns past the token budget stay in the window until they have been
+        summarised, so nothing drops out of the prompt in between.
+        """
+        memory = await self.get(key)
+        return memory.summary, [(role, content) for role, content, _ in memory.turns]
+
+    async def append(self, key: str, turns: List[Tuple[str, str]]):
+        """Record (role, content) turns in memory and on disk, with one file write"""
+        memory = await self.get(key)
+        for role, content in turns:
+            memory.turns.append((role, content, count_tokens(content)))
+        await asyncio.to_thread(
+            self._append_records, key,
+            [{"type": "turn", "role": role, "content": content} for role, content in turns]
+        )
+
+    def schedule_summary(self, key: str, summarize: Callable[[str, List[Tuple[str, str]]], Awaitable[str]]):
+        """Summarise turns outside the token budget, in the background, once enough have piled up.
+
+        `summarize(previous_summary, turns)` returns the new summary.
+        """
+        memory = self._threads.get(key)
+        if key in self._summarizing or memory is None:
+            return
+        pending = memory.turns[:memory.window_start(self.token_budget)]
+        upto = memory.summarized_upto + len(pending)
+        if sum(tokens for _, _, tokens in pending) < self.summary_threshold:
+            return
+
+        async def run():
+            try:
+                summary = await summarize(memory.summary, [(role, content) for role, content, _ in pending])
+                # Turns appended meanwhile are at the end, past the summarised ones
+                memory.turns = memory.turns[len(pending):]
+                memory.summary = summary
+                memory.summarized_upto = upto
+                await asyncio.to_thread(
+                    self._append_records, key, [{"type": "summary", "content": summary, "upto": upto}]
+                )
+                self.summaries += 1
+            except Exception as e:
+                logger.warning(f"Conversation summarisation failed: {e}")
+            finally:
+                self._summarizing.pop(key, None)
+
+        self._summarizing[key] = asyncio.create_task(run())
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "threads_in_memory": len(self._threads),
+            "loads_from_disk": self.loads,
+            "evictions": self.evictions,
+            "summaries": self.summaries,
+            "summaries_in_flight": len(self._summarizing)
+        }
+
+conversation_store = ConversationStore()
+metrics.register("conversation_memory", conversation_store.snapshot)
@@ -0,0 +1,74 @@
+import hashlib
+import threading
+from typing import Any, Dict, Iterable, List
+from langchain_core.messages import BaseMessage, SystemMessage
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from agents.base import AgentConfig
+from agents.llm import count_tokens
+from utils.metrics import metrics
+
+class CompiledPrompt:
+    """An agent's chat prompt, built once, with its static cost precomputed.
+
+    The system prompt is a literal SystemMessage at the head of the prompt,
+    never re-templated, so every call starts with the same bytes. Everything
+    that varies per call (conversation summary, history, the new message)
+    goes after it in the "messages" placeholder, which keeps the prefix
+    eligible for provider-side prompt caching.
+    """
+
+    def __init__(self, config: AgentConfig):
+        self.name = config.name
+        self.system_prompt = config.system_prompt.strip()
+        self.template = ChatPromptTemplate.from_messages([
+            SystemMessage(content=self.system_prompt),
+            MessagesPlaceholder(variable_name="messages"),
+        ])
+        self.system_tokens = count_tokens(self.system_prompt)
+        self.prefix_hash = hashlib.sha256(self.system_prompt.encode()).hexdigest()[:16]
+        self.calls = 0
+        self.prompt_tokens = 0
+
+    def record(self, messages: List[BaseMessage]) -> int:
+        """Account for one call with these variable messages; returns its prompt tokens"""
+        tokens = self.system_tokens + sum(count_tokens(m.content) for m in messages)
+        self.calls += 1
+        self.prompt_tokens += tokens
+        return tokens
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "system_tokens": self.system_tokens,
+            "system_chars": len(self.system_prompt),
+            "prefix_hash": self.prefix_hash,
+            "calls": self.calls,
+            "prompt_tokens_total": self.prompt_tokens,
+            "avg_prompt_tokens": round(self.prompt_tokens / self.calls, 1) if self.calls else None
+        }
+
+class PromptRegistry:
+    """Compiled prompts keyed by agent name"""
+
+    def __init__(self):
+        self._prompts: Dict[str, CompiledPrompt] = {}
+        self._lock = threading.Lock()
+
+    def get(self, config: AgentConfig) -> CompiledPrompt:
+        prompt = self._prompts.get(config.name)
+        if prompt is None or prompt.system_prompt != config.system_prompt.strip():
+            with self._lock:
+                prompt = self._prompts.get(config.name)
+                if prompt is None or prompt.system_prompt != config.system_prompt.strip():
+                    prompt = self._prompts[config.name] = CompiledPrompt(config)
+        return prompt
+
+    def compile_all(self, configs: Iterable[AgentConfig]):
+        """Compile prompts up front so their sizes show in /metrics before first use"""
+        for config in configs:
+            self.get(config)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {name: prompt.snapshot() for name, prompt in self._prompts.items()}
+
+prompt_registry = PromptRegistry()
+metrics.register("prompts", prompt_registry.snapshot)
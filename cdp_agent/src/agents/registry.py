@@ -0,0 +1,72 @@
+import asyncio
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Type
+from agents.base import BaseAgent, AgentConfig
+
+logger = logging.getLogger(__name__)
+
+class AgentNotFoundError(KeyError):
+    """Raised when an agent id has no entry in AGENT_CONFIGS"""
+
+class AgentRegistry:
+    """Builds agents on first use and keeps them for the life of the process"""
+
+    def __init__(self, configs: Dict[str, AgentConfig], classes: Dict[str, Type[BaseAgent]]):
+        self.configs = configs
+        self.classes = classes
+        self._agents: Dict[str, BaseAgent] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, agent_id: str) -> bool:
+        return agent_id in self.configs
+
+    def available(self) -> List[str]:
+        """All agent ids that can be served"""
+        return list(self.configs.keys())
+
+    def loaded(self) -> List[str]:
+        """Agent ids that have already been constructed"""
+        return list(self._agents.keys())
+
+    def get(self, agent_id: str) -> BaseAgent:
+        """Return the agent for agent_id, constructing it on first access"""
+        agent = self._agents.get(agent_id)
+        if agent is not None:
+            return agent
+        if agent_id not in self.configs:
+            raise AgentNotFoundError(agent_id)
+
+        with self._lock:
+            # Another caller may have finished building it while we waited
+            agent = self._agents.get(agent_id)
+            if agent is None:
+                agent_class = self.classes.get(agent_id) or self.classes["default"]
+                logger.info(f"Building agent {agent_id} ({agent_class.__name__})")
+                agent = agent_class(self.configs[agent_id])
+                self._agents[agent_id] = agent
+        return agent
+
+    async def aget(self, agent_id: str) -> BaseAgent:
+        """Async variant of get that builds agents off the event loop"""
+        agent = self._agents.get(agent_id)
+        if agent is not None:
+            return agent
+        if agent_id not in self.configs:
+            raise AgentNotFoundError(agent_id)
+        # Agent construction touches the CDP SDK and the vault, which block
+        return await asyncio.to_thread(self.get, agent_id)
+
+    def warmup(self, agent_ids: Optional[Iterable[str]] = None) -> Dict[str, str]:
+        """Pre-build a subset of agents (all of them when agent_ids is None)"""
+        results = {}
+        for agent_id in (agent_ids if agent_ids is not None else self.available()):
+            try:
+                self.get(agent_id)
+                results[agent_id] = "loaded"
+            except AgentNotFoundError:
+                results[agent_id] = "not_found"
+            except Exception as e:
+                logger.error(f"Failed to warm up agent {agent_id}: {e}")
+                results[agent_id] = f"error: {e}"
+        return results
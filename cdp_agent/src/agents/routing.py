@@ -0,0 +1,108 @@
+import logging
+import os
+from typing import Any, Dict, List, Tuple
+from langchain_core.language_models.chat_models import BaseChatModel
+from agents.base import AgentConfig
+from agents.financial_advisor import INTENT_KEYWORDS as FINANCIAL_ADVISOR_INTENTS
+from agents.god import INTENT_KEYWORDS as GOD_INTENTS
+from agents.llm import count_tokens, get_chat_model
+from utils.metrics import LatencyTracker, metrics
+
+logger = logging.getLogger(__name__)
+
+LLM_FAST_MODEL = os.getenv("LLM_FAST_MODEL", "gpt-4o-mini")
+LLM_LARGE_MODEL = os.getenv("LLM_LARGE_MODEL", "gpt-4o")
+# Blended USD per 1K prompt+completion tokens (list prices, 3:1 prompt to
+# completion), for the cost estimate in /metrics
+LLM_FAST_COST_PER_1K = float(os.getenv("LLM_FAST_COST_PER_1K", "0.00026"))
+LLM_LARGE_COST_PER_1K = float(os.getenv("LLM_LARGE_COST_PER_1K", "0.0044"))
+# Messages scoring at or above this go to the large model; AgentConfig.routing_threshold overrides it
+LLM_ROUTING_THRESHOLD = float(os.getenv("LLM_ROUTING_THRESHOLD", "0.5"))
+# A message this long scores 1.0 regardless of intent
+LLM_ROUTING_LONG_MESSAGE_TOKENS = int(os.getenv("LLM_ROUTING_LONG_MESSAGE_TOKENS", "200"))
+
+# The agents' own keyword tables, checked in this order; the first match wins
+INTENT_TABLES: List[Dict[str, List[str]]] = [GOD_INTENTS, FINANCIAL_ADVISOR_INTENTS]
+
+# How much reasoning each intent needs, 0 (chit-chat) to 1 (hard analysis)
+INTENT_COMPLEXITY = {
+    "general": 0.0,
+    "market_analysis": 0.3,
+    "portfolio": 0.3,
+    "token_deployment": 0.4,
+    "general_advice": 0.4,
+    "trading": 0.7,
+    "trade_suggestion": 0.7,
+    "yield_farming": 0.7,
+    "yield_analysis": 0.7,
+    "governance": 0.8,
+    "risk_assessment": 0.8,
+}
+
+def classify_intent(message: str) -> str:
+    """Intent of a message by the GodAgent and FinancialAdvisor keyword tables"""
+    message = message.lower()
+    for table in INTENT_TABLES:
+        for intent, keywords in table.items():
+            if any(word in message for word in keywords):
+                return intent
+    return "general"
+
+class ModelTier:
+    def __init__(self, name: str, model: str, cost_per_1k: float):
+        self.name = name
+        self.model = model
+        self.cost_per_1k = cost_per_1k
+        self.calls = 0
+        self.tokens = 0
+        self.latency = LatencyTracker()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "calls": self.calls,
+            "tokens": self.tokens,
+            "estimated_cost_usd": round(self.tokens / 1000 * self.cost_per_1k, 4),
+            "latency": self.latency.snapshot()
+        }
+
+class ModelRouter:
+    """Sends simple intents to a fast model and analytical ones to a larger model.
+
+    A message scores the complexity of its intent, or more if it is long,
+    and goes to the large tier when the score reaches the agent's threshold.
+    """
+
+    def __init__(self):
+        self.tiers = {
+            "fast": ModelTier("fast", LLM_FAST_MODEL, LLM_FAST_COST_PER_1K),
+            "large": ModelTier("large", LLM_LARGE_MODEL, LLM_LARGE_COST_PER_1K),
+        }
+        if LLM_FAST_MODEL == LLM_LARGE_MODEL:
+            logger.warning(f"LLM_FAST_MODEL and LLM_LARGE_MODEL are both {LLM_FAST_MODEL}; routing has no effect")
+
+    def score(self, message: str) -> Tuple[str, float]:
+        intent = classify_intent(message)
+        length_score = min(1.0, count_tokens(message) / LLM_ROUTING_LONG_MESSAGE_TOKENS)
+        return intent, max(INTENT_COMPLEXITY[intent], length_score)
+
+    def route(self, config: AgentConfig, message: str) -> str:
+        """Tier name for this message"""
+        threshold = config.routing_threshold if config.routing_threshold is not None else LLM_ROUTING_THRESHOLD
+        _, score = self.score(message)
+        return "large" if score >= threshold else "fast"
+
+    def model(self, tier: str, temperature: float) -> BaseChatModel:
+        return get_chat_model(temperature, self.tiers[tier].model)
+
+    def record(self, tier: str, latency_ms: float, tokens: int):
+        model_tier = self.tiers[tier]
+        model_tier.calls += 1
+        model_tier.tokens += tokens
+        model_tier.latency.record(latency_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {name: tier.snapshot() for name, tier in self.tiers.items()}
+
+model_router = ModelRouter()
+metrics.register("model_tiers", model_router.snapshot)
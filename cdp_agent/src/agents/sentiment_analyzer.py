@@ -19,6 +19,7 @@ class SentimentAnalyzerMixin(CDPAgentMixin):
 
 class SentimentAnalyzer(BaseAgent, SentimentAnalyzerMixin):
     """Sentiment Analyzer agent specializing in social sentiment analysis"""
+    coalesce_requests = False  # calls Wow buy/sell
     
     def __init__(self, config: AgentConfig):
         BaseAgent.__init__(self, config)
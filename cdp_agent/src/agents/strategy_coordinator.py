@@ -18,6 +18,7 @@ class StrategyCoordinatorMixin(CDPAgentMixin):
 
 class StrategyCoordinator(BaseAgent, StrategyCoordinatorMixin):
     """Strategy Coordinator agent for governance coordination"""
+    coalesce_requests = False  # transfers tokens
     
     def __init__(self, config: AgentConfig):
         BaseAgent.__init__(self, config)
@@ -0,0 +1,61 @@
+import asyncio
+import contextvars
+import json
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+from agents.base import BaseAgent, AgentResponse
+from utils.admission import Overloaded
+
+logger = logging.getLogger(__name__)
+
+# Queue of the streaming client for the current request, None when not streaming
+_event_queue: contextvars.ContextVar[Optional[asyncio.Queue]] = contextvars.ContextVar(
+    "agent_event_queue", default=None
+)
+
+def is_streaming() -> bool:
+    """Whether the current request has a streaming client attached"""
+    return _event_queue.get() is not None
+
+def emit_event(event: str, data: Dict[str, Any]):
+    """Publish a progress event to the streaming client of the current request, if any"""
+    queue = _event_queue.get()
+    if queue is not None:
+        queue.put_nowait((event, data))
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Encode one Server-Sent Events frame"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+async def stream_agent_response(agent: BaseAgent, thread_id: str,
+                                run: Callable[[], Awaitable[AgentResponse]]) -> AsyncIterator[str]:
+    """Run the agent (via `run`) and yield its progress events as SSE frames.
+
+    Emits `start` immediately, then `token` / `capability_start` /
+    `capability_end` events as they happen, and finally `response` (the
+    same payload as the non-streaming endpoint) or `error`.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    context = contextvars.copy_context()
+    context.run(_event_queue.set, queue)
+    task = asyncio.create_task(run(), context=context)
+    # None marks the end of the stream
+    task.add_done_callback(lambda _: queue.put_nowait(None))
+
+    try:
+        yield format_sse("start", {"agent": agent.config.name, "thread_id": thread_id})
+        while (item := await queue.get()) is not None:
+            yield format_sse(*item)
+
+        try:
+            response = task.result()
+            yield format_sse("response", response.model_dump())
+        except Overloaded as e:
+            yield format_sse("error", {"error": str(e), "retry_after": e.retry_after})
+        except Exception as e:
+            logger.error(f"Streaming request failed: {e}")
+            yield format_sse("error", {"error": str(e)})
+    finally:
+        # The client went away before the agent finished
+        if not task.done():
+            task.cancel()
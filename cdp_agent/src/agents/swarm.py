@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+from pydantic import BaseModel
+from web3 import Web3
+from agents.base import AgentRequest
+from agents.dispatch import BatchItemResult, run_item
+from agents.registry import AgentRegistry
+from capabilities.cdp_base import WalletManager
+from config.swarms import (
+    SWARM_CONTRACT_ADDRESS, SWARM_RPC_URL, SWARM_CACHE_TTL,
+    SWARM_MANAGER_ABI, ONCHAIN_AGENT_IDS
+)
+
+logger = logging.getLogger(__name__)
+
+# SwarmStatus enum in AISwarmManager
+SWARM_STATUS_ACTIVE = 1
+
+class SwarmNotFoundError(LookupError):
+    """Raised when the swarm does not exist on chain"""
+
+class SwarmInactiveError(RuntimeError):
+    """Raised when the swarm exists but is not Active"""
+
+class SwarmRequest(AgentRequest):
+    # Restrict the fan-out to these member agents (all members when omitted)
+    agents: Optional[List[str]] = None
+
+class SwarmResponse(BaseModel):
+    swarm_id: int
+    thread_id: str
+    agents: List[str]
+    content: str
+    results: Dict[str, BatchItemResult]
+    latency_ms: float
+
+class SwarmResolver:
+    """Resolves AISwarmManager swarm membership to API agent ids"""
+
+    def __init__(self, rpc_url: str = SWARM_RPC_URL, contract_address: str = SWARM_CONTRACT_ADDRESS,
+                 ttl: float = SWARM_CACHE_TTL):
+        self.web3 = Web3(Web3.HTTPProvider(rpc_url))
+        self.contract = self.web3.eth.contract(
+            address=Web3.to_checksum_address(contract_address),
+            abi=SWARM_MANAGER_ABI
+        )
+        self.ttl = ttl
+        self._cache: Dict[int, Tuple[float, List[str]]] = {}
+
+    def _read_members(self, swarm_id: int) -> List[str]:
+        """Read the swarm from chain (blocking)"""
+        try:
+            details = self.contract.functions.getSwarmDetails(swarm_id).call()
+            agent_ids = self.contract.functions.getSwarmAgents(swarm_id).call()
+        except Exception as e:
+            # The contract reverts with "Swarm does not exist" for unknown ids
+            if "does not exist" in str(e):
+                raise SwarmNotFoundError(f"Swarm {swarm_id} does not exist")
+            raise
+
+        if details[3] != SWARM_STATUS_ACTIVE:
+            raise SwarmInactiveError(f"Swarm {swarm_id} is not active")
+
+        members = []
+        for onchain_id in agent_ids:
+            agent_id = ONCHAIN_AGENT_IDS.get(int(onchain_id))
+            if agent_id:
+                members.append(agent_id)
+            else:
+                logger.warning(f"Swarm {swarm_id} has unknown on-chain agent {onchain_id}")
+        return members
+
+    async def get_members(self, swarm_id: int) -> List[str]:
+        """Agent ids of the swarm, cached for SWARM_CACHE_TTL seconds"""
+        cached = self._cache.get(swarm_id)
+        if cached and time.monotonic() - cached[0] < self.ttl:
+            return cached[1]
+        members = await asyncio.to_thread(self._read_members, swarm_id)
+        self._cache[swarm_id] = (time.monotonic(), members)
+        return members
+
+async def preload_wallets(registry: AgentRegistry, members: List[str], thread_id: str):
+    """Resolve the members' wallets on this thread with one vault read, so the
+    fan-out finds them cached instead of each agent reading the vault"""
+    try:
+        wallet_manager = await asyncio.to_thread(WalletManager, "data/agent_wallets.json")
+        await wallet_manager.resolve_thread_wallets(
+            thread_id, [registry.configs[agent_id].name for agent_id in members]
+        )
+    except Exception as e:
+        logger.warning(f"Could not preload swarm wallets for thread {thread_id}: {e}")
+
+async def run_swarm(registry: AgentRegistry, resolver: SwarmResolver, swarm_id: int,
+                    thread_id: str, request: SwarmRequest) -> SwarmResponse:
+    """Send the message to every member agent in parallel and merge the replies"""
+    started = time.perf_counter()
+    members = await resolver.get_members(swarm_id)
+    if request.agents is not None:
+        members = [agent_id for agent_id in members if agent_id in request.agents]
+
+    await preload_wallets(registry, members, thread_id)
+    agent_request = AgentRequest(message=request.message, from_user=request.from_user)
+    results = await asyncio.gather(*(
+        run_item(registry, agent_id, thread_id, agent_request) for agent_id in members
+    ))
+
+    merged = []
+    for result in results:
+        if result.status == "success":
+            name = registry.configs[result.agent_id].name
+            merged.append(f"{name}:\n{result.response.content}")
+
+    return SwarmResponse(
+        swarm_id=swarm_id,
+        thread_id=thread_id,
+        agents=members,
+        content="\n\n".join(merged),
+        results={result.agent_id: result for result in results},
+        latency_ms=round((time.perf_counter() - started) * 1000, 1)
+    )
@@ -7,6 +7,7 @@ import re
 
 logger = logging.getLogger(__name__)
 class TokenDeploymentAgent(BaseAgent, TokenDeploymentMixin):
+    coalesce_requests = False  # deploys tokens
     def __init__(self, config: AgentConfig):
         BaseAgent.__init__(self, config)
         TokenDeploymentMixin.__init__(self)
@@ -1,5 +1,8 @@
+import time
 from typing import Dict, Any, List, Type
+from agents.streaming import emit_event
 from .cdp_base import CDPCapability, WalletManager
+from .prefetch import lookup as lookup_prefetched
 
 # Import all capabilities
 from .asset_capabilities import (
@@ -27,13 +30,25 @@ from .wow_capabilities import (
 
 class CDPAgentMixin:
     """Base mixin for adding CDP capabilities to agents"""
-    
+
+    # Capabilities hold no per-agent state, so one instance per class is shared
+    _shared_capabilities: Dict[Type[CDPCapability], CDPCapability] = {}
+
     def __init__(self, capabilities: List[Type[CDPCapability]] = None):
         self.wallet_manager = WalletManager("data/agent_wallets.json")
         self.capabilities: Dict[str, CDPCapability] = {}
         if capabilities:
             for cap in capabilities:
-                self.add_capability(cap())
+                self.add_capability(self._get_shared_capability(cap))
+
+    @staticmethod
+    def _get_shared_capability(capability_class: Type[CDPCapability]) -> CDPCapability:
+        """Return the process-wide instance of a capability class"""
+        capability = CDPAgentMixin._shared_capabilities.get(capability_class)
+        if capability is None:
+            capability = capability_class()
+            CDPAgentMixin._shared_capabilities[capability_class] = capability
+        return capability
 
     def add_capability(self, capability: CDPCapability):
         """Add a CDP capability to the agent"""
@@ -47,9 +62,21 @@ class CDPAgentMixin:
                 "status": "error",
                 "error": f"Capability {capability_name} not found"
             }
-        return await self.capabilities[capability_name].execute(
-            agent_name, thread_id, **kwargs
-        )
+        emit_event("capability_start", {"capability": capability_name})
+        started = time.perf_counter()
+        prefetched = lookup_prefetched(capability_name, agent_name, thread_id, kwargs)
+        if prefetched is not None:
+            result = await prefetched
+        else:
+            result = await self.capabilities[capability_name].execute(
+                agent_name, thread_id, **kwargs
+            )
+        emit_event("capability_end", {
+            "capability": capability_name,
+            "status": result.get("status") if isinstance(result, dict) else None,
+            "latency_ms": round((time.perf_counter() - started) * 1000, 1)
+        })
+        return result
 
 class TokenDeploymentMixin(CDPAgentMixin):
     """Mixin for token deployment capabilities"""
@@ -6,15 +6,16 @@ logger = logging.getLogger(__name__)
 
 class BalanceCapability(CDPCapability):
     """Get balance for specific assets"""
+    pool_size = 16
     async def execute(self, agent_name: str, thread_id: str, 
                      asset_id: Optional[str] = None) -> Dict[str, Any]:
         try:
             wallet = await self.wallet_manager.get_or_create_wallet(agent_name, thread_id)
             if asset_id:
-                balance = wallet.balance(asset_id)
+                balance = await self.run_blocking(wallet.balance, asset_id)
                 return {"status": "success", "balance": str(balance), "asset": asset_id}
             else:
-                balances = wallet.balances()
+                balances = await self.run_blocking(wallet.balances)
                 return {"status": "success", "balances": {k: str(v) for k, v in balances.items()}}
         except Exception as e:
             logger.error(f"Balance check failed: {e}")
@@ -22,13 +23,15 @@ class BalanceCapability(CDPCapability):
 
 class TransferCapability(CDPCapability):
     """Transfer assets between addresses"""
+    pool_size = 4
     async def execute(self, agent_name: str, thread_id: str, 
                      amount: float, asset_id: str, destination: str,
                      gasless: bool = False) -> Dict[str, Any]:
-        wallet = await self.wallet_manager.get_or_create_wallet(agent_name, thread_id)
+        wallet = await self.funded_wallet(agent_name, thread_id)
         try:
-            transfer = wallet.transfer(amount, asset_id, destination, gasless=gasless)
-            result = transfer.wait()
+            result = await self.run_blocking(
+                lambda: wallet.transfer(amount, asset_id, destination, gasless=gasless).wait()
+            )
             return {
                 "status": "success",
                 "transaction_hash": result.transaction_hash,
@@ -42,12 +45,12 @@ class TransferCapability(CDPCapability):
 
 class TradeCapability(CDPCapability):
     """Trade assets (mainnets only)"""
+    pool_size = 4
     async def execute(self, agent_name: str, thread_id: str,
                      amount: float, from_asset: str, to_asset: str) -> Dict[str, Any]:
-        wallet = await self.wallet_manager.get_or_create_wallet(agent_name, thread_id, "base-mainnet")
+        wallet = await self.funded_wallet(agent_name, thread_id, "base-mainnet")
         try:
-            trade = wallet.trade(amount, from_asset, to_asset)
-            result = trade.wait()
+            result = await self.run_blocking(lambda: wallet.trade(amount, from_asset, to_asset).wait())
             return {
                 "status": "success",
                 "transaction_hash": result.transaction_hash,
@@ -61,13 +64,13 @@ class TradeCapability(CDPCapability):
 
 class WrapETHCapability(CDPCapability):
     """Wrap ETH to WETH"""
+    pool_size = 4
     async def execute(self, agent_name: str, thread_id: str,
                      amount: float) -> Dict[str, Any]:
-        wallet = await self.wallet_manager.get_or_create_wallet(agent_name, thread_id)
+        wallet = await self.funded_wallet(agent_name, thread_id)
         try:
             # Call wrap_eth method
-            transaction = wallet.wrap_eth(amount)
-            result = transaction.wait()
+            result = await self.run_blocking(lambda: wallet.wrap_eth(amount).wait())
             return {
                 "status": "success",
                 "transaction_hash": result.transaction_hash,
@@ -1,6 +1,8 @@
+import asyncio
 import json
 import os
-from typing import Dict, Optional, Any
+import threading
+from typing import Dict, List, Optional, Any
 from abc import ABC, abstractmethod
 from cdp import Wallet, Cdp
 from pathlib import Path
@@ -9,23 +11,45 @@ from config.cdp_config import initialize_cdp
 from src.storage.nildbapi import NilDBAPI
 from src.storage.config import NODE_CONFIG
 from src.storage.secret_vault_storage import WalletStorage
+from src.storage.shared_store import shared_store
 from datetime import datetime
+from utils.cache import TTLCache
+from utils.metrics import metrics
+from utils.singleflight import SingleFlight
+from .executor import capability_executor, DEFAULT_POOL_SIZE
+from .funding import FundingQueue
+from .wallet_pool import WalletPool
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Hydrated Wallet objects kept per (agent, thread, network) in this process
+WALLET_CACHE_SIZE = int(os.getenv("WALLET_CACHE_SIZE", "1024"))
+WALLET_CACHE_TTL = float(os.getenv("WALLET_CACHE_TTL", "300"))
+# How long one worker may hold the right to create a given wallet
+WALLET_CREATION_LEASE = float(os.getenv("WALLET_CREATION_LEASE", "120"))
+
 class WalletManager:
     """Manages wallet creation and storage for agents"""
     _instance = None
     _initialized = False
+    # Startup, the swarm and the agent registry build this from worker
+    # threads; the lock makes sure exactly one of them initializes it
+    _lock = threading.Lock()
 
     def __new__(cls, storage_path: str = "agent_wallets.json"):
         if cls._instance is None:
-            cls._instance = super(WalletManager, cls).__new__(cls)
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(WalletManager, cls).__new__(cls)
         return cls._instance
 
     def __init__(self, storage_path: str = "agent_wallets.json", node_id: str = "node_a"):
-        if not self._initialized:
+        if self._initialized:
+            return
+        with WalletManager._lock:
+            if self._initialized:
+                return
             # Initialize CDP SDK first
             initialize_cdp()
             
@@ -40,88 +64,23 @@ class WalletManager:
             self.vault = WalletStorage()
             self.schema_id = self._initialize_schema()
             self.wallets = {}
+            self.wallet_cache = TTLCache(WALLET_CACHE_SIZE, WALLET_CACHE_TTL)
+            metrics.register("wallet_cache", self.wallet_cache.snapshot)
+            # Concurrent lookups of one wallet share a single resolution, so
+            # a cold key is fetched or created once, not once per caller
+            self.wallet_resolutions = SingleFlight()
+            metrics.register("wallet_resolution", self.wallet_resolutions.snapshot)
+            self.wallet_pool = WalletPool(self)
+            metrics.register("wallet_pool", self.wallet_pool.snapshot)
+            self.funding_queue = FundingQueue(self)
+            metrics.register("wallet_funding", self.funding_queue.snapshot)
             self._initialized = True
     
     def _initialize_schema(self) -> str:
         """Initialize or get existing schema for Nillion vault"""
-        SCHEMA_FILE = "data/nillion_schema_id.txt"
-        
-        try:
-            # First check if schema ID exists in local storage
-            if os.path.exists(SCHEMA_FILE):
-                with open(SCHEMA_FILE, 'r') as f:
-                    schema_id = f.read().strip()
-                    if schema_id:
-                        logger.info("Using existing schema ID from local storage")
-                        return schema_id
-
-            # If no schema ID in local storage, create new schema
-            logger.info("No existing schema ID found, creating new one")
-            
-            # Default schema definition
-            DEFAULT_SCHEMA = {
-                "$schema": "http://json-schema.org/draft-07/schema#",
-                "type": "array",
-                "items": {
-                    "type": "object",
-                    "properties": {
-                        "_id": {
-                            "type": "string",
-                            "format": "uuid",
-                            "coerce": True
-                        },
-                        "agent_name": {
-                            "type": "string"
-                        },
-                        "thread_id": {
-                            "type": "string"
-                        },
-                        "wallet_id": {
-                            "type": "string"
-                        },
-                        "network_id": {
-                            "type": "string"
-                        },
-                        "encrypted_seed": {
-                            "type": "string"
-                        },
-                        "created_at": {
-                            "type": "string",
-                            "format": "date-time",
-                            "coerce": True
-                        }
-                    },
-                    "required": [
-                        "_id",
-                        "agent_name",
-                        "thread_id",
-                        "wallet_id",
-                        "encrypted_seed"
-                    ],
-                    "additionalProperties": False
-                }
-            }
-
-            schema_id = str(uuid.uuid4())
-            
-            for node_name in NODE_CONFIG.keys():
-                payload = {
-                    "_id": schema_id,
-                    "name": "wallet_storage",
-                    "keys": ["_id"],
-                    "schema": DEFAULT_SCHEMA
-                }
-                self.nildb_api.create_schema(node_name, payload)
-            
-            # Store the new schema ID
-            with open(SCHEMA_FILE, 'w') as f:
-                f.write(schema_id)
-                
-            return schema_id
-
-        except Exception as e:
-            logger.error(f"Error initializing schema: {e}")
-            raise
+        # WalletStorage creates the schema once per host via the shared store,
+        # so workers no longer race on data/nillion_schema_id.txt
+        return self.vault.schema_id
     
     def _load_wallets(self) -> Dict[str, Dict[str, Any]]:
         """Load existing wallets from Nillion vault"""
@@ -133,18 +92,116 @@ class WalletManager:
         """Save wallets to storage - no longer needed with Nillion"""
         pass  # No need to save all wallets at once with Nillion
     
+    async def _run_blocking(self, fn, *args, **kwargs):
+        """Run a blocking SDK or vault call on the wallet manager's thread pool"""
+        return await capability_executor.run("WalletManager", DEFAULT_POOL_SIZE, fn, *args, **kwargs)
+
     def get_wallet_key(self, agent_name: str, thread_id: str) -> str:
         """Generate unique key for wallet storage"""
         return f"{agent_name}_{thread_id}"
+
+    def _make_wallet_handle(self, wallet_id: str, network_id: str) -> Dict[str, Any]:
+        """Wallet handle as kept in the shared store; seeds stay in the vault"""
+        return {
+            "wallet_id": wallet_id,
+            "network_id": network_id
+        }
+
+    def _hydrate_wallet(self, handle: Dict[str, Any]) -> Optional[Wallet]:
+        """Fetch the CDP wallet for a shared-store handle, with its seed from the vault (blocking)"""
+        record = self.vault.get_wallet_by_id(self.node_id, handle["wallet_id"], self.schema_id)
+        if not record:
+            return None
+        wallet = Wallet.fetch(handle["wallet_id"])
+        if wallet:
+            wallet._seed = record["seed_data"]
+        return wallet
     
     async def get_or_create_wallet(self, agent_name: str, thread_id: str, network_id: str = "base-sepolia") -> Wallet:
         """Get existing wallet or create new one for agent+thread combination"""
+        cache_key = (agent_name, thread_id, network_id)
+        wallet = self.wallet_cache.get(cache_key)
+        if wallet is None:
+            # Keyed without the network: stored wallets are per (agent, thread),
+            # so callers on different networks resolve to the same wallet
+            wallet = await self.wallet_resolutions.do(
+                self.get_wallet_key(agent_name, thread_id),
+                lambda: self._resolve_and_cache(agent_name, thread_id, network_id)
+            )
+        return wallet
+
+    async def _resolve_and_cache(self, agent_name: str, thread_id: str, network_id: str) -> Wallet:
+        wallet = await self._resolve_wallet(agent_name, thread_id, network_id)
+        self.wallet_cache.set((agent_name, thread_id, network_id), wallet)
+        return wallet
+
+    async def resolve_thread_wallets(self, thread_id: str, agent_names: Optional[List[str]] = None,
+                                     network_id: str = "base-sepolia") -> Dict[str, Wallet]:
+        """Load every stored wallet on a thread into the wallet cache with one vault read.
+
+        Agents already cached are skipped; agents without a stored wallet are
+        left for get_or_create_wallet. Returns the wallets now cached, by agent name.
+        """
+        wallets = {}
+        if agent_names is not None:
+            for agent_name in agent_names:
+                wallet = self.wallet_cache.get((agent_name, thread_id, network_id))
+                if wallet is not None:
+                    wallets[agent_name] = wallet
+            if len(wallets) == len(agent_names):
+                return wallets
+
+        records = await self._run_blocking(self.vault.get_wallets_for_thread, self.node_id, thread_id, self.schema_id)
+        pending = {
+            agent_name: record for agent_name, record in records.items()
+            if agent_name not in wallets
+            and (agent_names is None or agent_name in agent_names)
+            and record.get("network_id", network_id) in (network_id, "")
+        }
+
+        async def hydrate(agent_name: str, record: Dict[str, Any]):
+            try:
+                wallet = await self._run_blocking(Wallet.fetch, record["wallet_id"])
+            except Exception as e:
+                logger.warning(f"Could not fetch wallet {record['wallet_id']} for {agent_name}: {e}")
+                return
+            if not wallet:
+                return
+            wallet._seed = record["seed_data"]
+            self.wallet_cache.set((agent_name, thread_id, network_id), wallet)
+            await self._run_blocking(
+                shared_store.set, "wallets", self.get_wallet_key(agent_name, thread_id),
+                self._make_wallet_handle(wallet.id, record["network_id"] or network_id)
+            )
+            wallets[agent_name] = wallet
+
+        await asyncio.gather(*(hydrate(agent_name, record) for agent_name, record in pending.items()))
+        return wallets
+
+    def invalidate_wallet(self, agent_name: str, thread_id: str, network_id: str = "base-sepolia"):
+        """Drop a cached wallet so the next lookup resolves it again"""
+        self.wallet_cache.invalidate((agent_name, thread_id, network_id))
+
+    async def _resolve_wallet(self, agent_name: str, thread_id: str, network_id: str) -> Wallet:
+        """Shared store, then vault, then a new wallet"""
         try:
             wallet_key = self.get_wallet_key(agent_name, thread_id)
+
+            # Another worker may already have resolved this wallet
+            handle = await self._run_blocking(shared_store.get, "wallets", wallet_key)
+            if handle:
+                try:
+                    wallet = await self._run_blocking(self._hydrate_wallet, handle)
+                    if wallet:
+                        return wallet
+                except Exception as e:
+                    logger.warning(f"Shared wallet handle for {wallet_key} is unusable: {e}")
+                await self._run_blocking(shared_store.delete, "wallets", wallet_key)
             
             # Try to retrieve from Nillion vault
             logger.info(f"Attempting to retrieve wallet from Nillion vault for {wallet_key}")
-            existing_wallet = self.vault.get_wallet(
+            existing_wallet = await self._run_blocking(
+                self.vault.get_wallet,
                 self.node_id,
                 agent_name,
                 thread_id,
@@ -155,12 +212,16 @@ class WalletManager:
                 logger.info(f"Found existing wallet in Nillion vault for {wallet_key}")
                 # Create CDP wallet from stored data
                 try:
-                    wallet = Wallet.fetch(existing_wallet["wallet_id"])
+                    wallet = await self._run_blocking(Wallet.fetch, existing_wallet["wallet_id"])
                     if not wallet:
                         logger.warning(f"Could not fetch wallet with ID {existing_wallet['wallet_id']}, creating new wallet")
                         return await self._create_new_wallet(agent_name, thread_id, network_id)
                     
                     wallet._seed = existing_wallet["seed_data"]
+                    await self._run_blocking(
+                        shared_store.set, "wallets", wallet_key,
+                        self._make_wallet_handle(wallet.id, existing_wallet["network_id"])
+                    )
                     return wallet
                 except Exception as e:
                     logger.error(f"Error reconstructing wallet from vault data: {e}")
@@ -174,11 +235,53 @@ class WalletManager:
             logger.info("Falling back to creating new wallet")
             return await self._create_new_wallet(agent_name, thread_id, network_id)
 
+    async def _await_created_wallet(self, wallet_key: str) -> Optional[Wallet]:
+        """Wait while another worker holds the creation lease; returns its wallet, or
+        None if the lease ended without one"""
+        while True:
+            handle = await self._run_blocking(shared_store.get, "wallets", wallet_key)
+            if handle:
+                logger.info(f"Another worker created the wallet for {wallet_key} first")
+                return await self._run_blocking(self._hydrate_wallet, handle)
+            if await self._run_blocking(shared_store.get, "wallet_creation", wallet_key) is None:
+                # Lease gone; one last look in case the handle landed just before it
+                handle = await self._run_blocking(shared_store.get, "wallets", wallet_key)
+                return await self._run_blocking(self._hydrate_wallet, handle) if handle else None
+            await asyncio.sleep(0.5)
+
     async def _create_new_wallet(self, agent_name: str, thread_id: str, network_id: str) -> Wallet:
-        """Create a new wallet and store in Nillion vault"""
+        """Create the wallet for this key once per host, waiting on any worker already creating it"""
+        wallet_key = self.get_wallet_key(agent_name, thread_id)
+        while not await self._run_blocking(shared_store.add, "wallet_creation", wallet_key,
+                                           os.getpid(), WALLET_CREATION_LEASE):
+            wallet = await self._await_created_wallet(wallet_key)
+            if wallet:
+                return wallet
+        try:
+            # The previous lease holder may have finished just before we took over
+            handle = await self._run_blocking(shared_store.get, "wallets", wallet_key)
+            if handle:
+                wallet = await self._run_blocking(self._hydrate_wallet, handle)
+                if wallet:
+                    return wallet
+            return await self._create_and_store_wallet(agent_name, thread_id, network_id)
+        finally:
+            await self._run_blocking(shared_store.delete, "wallet_creation", wallet_key)
+
+    async def _create_and_store_wallet(self, agent_name: str, thread_id: str, network_id: str) -> Wallet:
+        """Create a new wallet (or claim a pooled one) and store in Nillion vault"""
         try:
-            # Create new wallet
-            wallet = Wallet.create(network_id=network_id)
+            # A pooled wallet is already created and funded
+            wallet = None
+            pooled = await self.wallet_pool.claim(network_id)
+            if pooled:
+                try:
+                    wallet = await self._run_blocking(self._hydrate_wallet, pooled)
+                except Exception as e:
+                    logger.warning(f"Pooled wallet {pooled['wallet_id']} is unusable: {e}")
+            from_pool = wallet is not None
+            if not from_pool:
+                wallet = await self._run_blocking(Wallet.create, network_id=network_id)
             wallet_key = self.get_wallet_key(agent_name, thread_id)
             
             # Prepare data for Nillion storage
@@ -193,7 +296,8 @@ class WalletManager:
             
             # Store in Nillion vault
             logger.info(f"Storing new wallet in Nillion vault for {wallet_key}")
-            storage_success = self.vault.store_wallet(
+            storage_success = await self._run_blocking(
+                self.vault.store_wallet,
                 self.node_id,
                 agent_name,
                 thread_id,
@@ -204,12 +308,20 @@ class WalletManager:
             
             if not storage_success:
                 logger.error("Failed to store wallet in Nillion vault")
+                if from_pool:
+                    await self.wallet_pool.release(pooled)
                 raise Exception("Failed to store wallet in Nillion vault")
             
             logger.info(f"Successfully stored wallet in Nillion vault for {wallet_key}")
+
+            # Publish the handle to workers waiting on the creation lease
+            await self._run_blocking(
+                shared_store.set, "wallets", wallet_key, self._make_wallet_handle(wallet.id, network_id)
+            )
             
-            # Request from faucet for new wallets
-            await self._fund_new_wallet(wallet)
+            # Request from faucet for new wallets, in the background
+            if not from_pool:
+                await self.funding_queue.enqueue(wallet, network_id)
             
             return wallet
         except Exception as e:
@@ -243,28 +355,42 @@ class WalletManager:
             print(f"Error retrieving wallet: {e}")
             return None
 
-    async def _fund_new_wallet(self, wallet: Wallet):
-        """Fund new wallet with test tokens"""
-        try:
-            # Request ETH from faucet
-            logger.info("Requesting ETH from faucet...")
-            faucet_tx = wallet.faucet()
-            faucet_tx.wait()
-            logger.info(f"Funded wallet with ETH: {wallet.balance('eth')} ETH")
-            
-            # Request USDC from faucet
-            logger.info("Requesting USDC from faucet...")
-            usdc_tx = wallet.faucet(asset_id="usdc")
-            usdc_tx.wait()
-            logger.info(f"Funded wallet with USDC: {wallet.balance('usdc')} USDC")
-        except Exception as e:
-            logger.warning(f"Failed to fund wallet from faucet: {e}")
+    async def funding_status(self, wallet: Wallet) -> str:
+        """Faucet funding status: pending, funded, failed, or unknown if never queued"""
+        return await self.funding_queue.status(wallet.id)
+
+    async def wait_until_funded(self, wallet: Wallet) -> str:
+        """Wait for pending faucet funding to finish; returns the final status"""
+        return await self.funding_queue.wait_until_funded(wallet.id)
 
 class CDPCapability(ABC):
     """Base class for CDP capabilities that can be added to agents"""
     
+    # Worker threads for this capability's blocking SDK calls
+    pool_size: int = DEFAULT_POOL_SIZE
+
     def __init__(self):
         self.wallet_manager = WalletManager("data/agent_wallets.json")
+
+    async def funded_wallet(self, agent_name: str, thread_id: str, network_id: str = "base-sepolia") -> Wallet:
+        """The agent's wallet, once any pending faucet funding has landed.
+
+        For capabilities that spend gas or tokens; read-only ones should use
+        get_or_create_wallet and not wait.
+        """
+        wallet = await self.wallet_manager.get_or_create_wallet(agent_name, thread_id, network_id)
+        await self.wait_for_funding(wallet)
+        return wallet
+
+    async def wait_for_funding(self, wallet: Wallet):
+        """Wait for the wallet's pending faucet funding, for paths that spend from it"""
+        status = await self.wallet_manager.wait_until_funded(wallet)
+        if status in ("pending", "failed"):
+            logger.warning(f"Wallet {wallet.id} funding is {status}; continuing without it")
+
+    async def run_blocking(self, fn, *args, **kwargs):
+        """Run a blocking SDK call on this capability's thread pool"""
+        return await capability_executor.run(self.__class__.__name__, self.pool_size, fn, *args, **kwargs)
     
     @abstractmethod
     async def execute(self, agent_name: str, thread_id: str, **kwargs):
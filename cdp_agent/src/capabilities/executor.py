@@ -0,0 +1,101 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+from utils.metrics import metrics, LatencyTracker
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = int(os.getenv("CAPABILITY_POOL_SIZE", "8"))
+
+class _PoolStats:
+    def __init__(self, size: int):
+        self.size = size
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+        self.errors = 0
+        self.wait = LatencyTracker()
+        self.run = LatencyTracker()
+
+class CapabilityExecutor:
+    """Bounded thread pools for the blocking CDP SDK work done by capabilities.
+
+    Each capability class gets its own pool so a slow write (e.g. a token
+    deployment waiting on-chain) cannot starve fast reads, and none of them
+    block the event loop. Pool sizes come from the capability's `pool_size`,
+    overridable with CAPABILITY_POOL_SIZE_<NAME> (e.g. CAPABILITY_POOL_SIZE_BALANCECAPABILITY).
+    """
+
+    def __init__(self):
+        self._pools: Dict[str, ThreadPoolExecutor] = {}
+        self._stats: Dict[str, _PoolStats] = {}
+        self._lock = threading.Lock()
+
+    def _get_pool(self, name: str, size: int) -> ThreadPoolExecutor:
+        pool = self._pools.get(name)
+        if pool is None:
+            with self._lock:
+                pool = self._pools.get(name)
+                if pool is None:
+                    size = int(os.getenv(f"CAPABILITY_POOL_SIZE_{name.upper()}", size))
+                    pool = ThreadPoolExecutor(max_workers=size, thread_name_prefix=name)
+                    self._stats[name] = _PoolStats(size)
+                    self._pools[name] = pool
+        return pool
+
+    async def run(self, name: str, size: int, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run fn(*args, **kwargs) on the `name` pool and await its result"""
+        pool = self._get_pool(name, size)
+        stats = self._stats[name]
+        submitted = time.perf_counter()
+        with self._lock:
+            stats.queued += 1
+
+        def call():
+            started = time.perf_counter()
+            with self._lock:
+                stats.queued -= 1
+                stats.active += 1
+            stats.wait.record((started - submitted) * 1000)
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                with self._lock:
+                    stats.errors += 1
+                raise
+            finally:
+                stats.run.record((time.perf_counter() - started) * 1000)
+                with self._lock:
+                    stats.active -= 1
+                    stats.completed += 1
+
+        def on_done(future):
+            # Cancelled while still queued, so call() never ran to dequeue it
+            if future.cancelled():
+                with self._lock:
+                    stats.queued -= 1
+
+        future = pool.submit(call)
+        future.add_done_callback(on_done)
+        return await asyncio.wrap_future(future)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            name: {
+                "pool_size": stats.size,
+                "queue_depth": stats.queued,
+                "active": stats.active,
+                "completed": stats.completed,
+                "errors": stats.errors,
+                "wait": stats.wait.snapshot(),
+                "run": stats.run.snapshot()
+            }
+            for name, stats in list(self._stats.items())
+        }
+
+capability_executor = CapabilityExecutor()
+metrics.register("capability_pools", capability_executor.snapshot)
@@ -0,0 +1,208 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+from cdp import Wallet
+from src.storage.shared_store import shared_store
+from utils.cache import TTLCache
+from utils.metrics import LatencyTracker
+from .executor import capability_executor
+
+logger = logging.getLogger(__name__)
+
+# Networks with a CDP faucet; wallets on other networks are not funded
+FUNDING_NETWORKS = [n.strip() for n in os.getenv("FUNDING_NETWORKS", "base-sepolia").split(",") if n.strip()]
+# Faucet jobs run at once per process (each blocks a thread on tx.wait())
+FUNDING_CONCURRENCY = int(os.getenv("FUNDING_CONCURRENCY", "4"))
+FUNDING_MAX_ATTEMPTS = int(os.getenv("FUNDING_MAX_ATTEMPTS", "5"))
+# First retry delay in seconds, doubled on each further failure
+FUNDING_RETRY_DELAY = float(os.getenv("FUNDING_RETRY_DELAY", "5"))
+FUNDING_POLL_INTERVAL = float(os.getenv("FUNDING_POLL_INTERVAL", "5"))
+# How long a capability that needs funds waits for a pending job
+FUNDING_WAIT_TIMEOUT = float(os.getenv("FUNDING_WAIT_TIMEOUT", "120"))
+# Finished jobs are kept this long so their status can still be read
+FUNDING_RECORD_TTL = float(os.getenv("FUNDING_RECORD_TTL", "86400"))
+# Finished statuses remembered in this process, to skip the shared-store read
+FUNDING_STATUS_CACHE_SIZE = int(os.getenv("FUNDING_STATUS_CACHE_SIZE", "4096"))
+# Seconds between sweeps that delete expired shared-store rows
+SHARED_STORE_PURGE_INTERVAL = float(os.getenv("SHARED_STORE_PURGE_INTERVAL", "600"))
+
+class FundingQueue:
+    """Persistent background queue of faucet funding jobs for new wallets.
+
+    Jobs live in the shared store, so they survive restarts and any worker
+    on the host can run them; a per-job lease keeps two workers from
+    funding the same wallet. Failed jobs are retried with exponential
+    backoff up to FUNDING_MAX_ATTEMPTS. A job's status is "pending",
+    "funded" or "failed"; wallets without a job report "unknown".
+    Finished jobs move to their own namespace with a TTL, so each pass
+    only reads the jobs still pending.
+    """
+
+    NAMESPACE = "funding_jobs"
+    FINISHED_NAMESPACE = "funding_results"
+
+    def __init__(self, wallet_manager):
+        self.wallet_manager = wallet_manager
+        self._wake: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._finished = TTLCache(FUNDING_STATUS_CACHE_SIZE, FUNDING_RECORD_TTL)  # wallet_id -> terminal status
+        self.enqueued = 0
+        self.funded = 0
+        self.failed = 0
+        self.retries = 0
+        self.time_to_funded = LatencyTracker()
+
+    async def _run_blocking(self, fn, *args):
+        return await capability_executor.run("FundingQueue", FUNDING_CONCURRENCY, fn, *args)
+
+    def ensure_worker(self):
+        """Start this process's worker if it is not running"""
+        if self._worker is None or self._worker.done():
+            self._wake = asyncio.Event()
+            self._worker = asyncio.create_task(self.run())
+
+    async def enqueue(self, wallet: Wallet, network_id: str) -> str:
+        """Queue faucet funding for a new wallet; returns its funding status"""
+        if network_id not in FUNDING_NETWORKS:
+            return "unknown"
+        job = {
+            "wallet_id": wallet.id,
+            "network_id": network_id,
+            "handle": self.wallet_manager._make_wallet_handle(wallet.id, network_id),
+            "status": "pending",
+            "attempts": 0,
+            "eth_funded": False,
+            "next_attempt_at": 0,
+            "enqueued_at": time.time(),
+            "error": None
+        }
+        await self.wallet_manager._run_blocking(shared_store.set, self.NAMESPACE, wallet.id, job)
+        self.enqueued += 1
+        self.ensure_worker()
+        self._wake.set()
+        return "pending"
+
+    async def status(self, wallet_id: str) -> str:
+        status = self._finished.get(wallet_id)
+        if status is not None:
+            return status
+        job = await self.wallet_manager._run_blocking(shared_store.get, self.NAMESPACE, wallet_id)
+        if job is None:
+            job = await self.wallet_manager._run_blocking(shared_store.get, self.FINISHED_NAMESPACE, wallet_id)
+        status = job["status"] if job else "unknown"
+        if status in ("funded", "failed"):
+            self._finished.set(wallet_id, status)
+        return status
+
+    async def wait_until_funded(self, wallet_id: str, timeout: float = FUNDING_WAIT_TIMEOUT) -> str:
+        """Wait while the wallet's funding is pending; returns the last status seen"""
+        deadline = time.monotonic() + timeout
+        status = await self.status(wallet_id)
+        if status == "pending":
+            self.ensure_worker()
+        while status == "pending" and time.monotonic() < deadline:
+            await asyncio.sleep(1)
+            status = await self.status(wallet_id)
+        return status
+
+    def fund_wallet_blocking(self, wallet: Wallet, job: Optional[Dict[str, Any]] = None):
+        """Request ETH and USDC from the faucet and wait for both (blocking).
+
+        Raises if either request fails. With a job, records ETH success on it
+        so a retry after a USDC failure does not ask for ETH again.
+        """
+        if not job or not job["eth_funded"]:
+            logger.info(f"Requesting ETH from faucet for {wallet.id}...")
+            wallet.faucet().wait()
+            if job:
+                job["eth_funded"] = True
+        logger.info(f"Requesting USDC from faucet for {wallet.id}...")
+        wallet.faucet(asset_id="usdc").wait()
+
+    def _fund_blocking(self, job: Dict[str, Any]):
+        wallet = self.wallet_manager._hydrate_wallet(job["handle"])
+        if not wallet:
+            raise Exception("wallet not found in the vault")
+        self.fund_wallet_blocking(wallet, job)
+
+    async def _process(self, wallet_id: str, job: Dict[str, Any]) -> bool:
+        """Run one job; returns False if another worker holds its lease"""
+        if not await self._run_blocking(shared_store.add, "funding_lease", wallet_id, os.getpid(), 600):
+            return False
+        try:
+            await self._run_blocking(self._fund_blocking, job)
+            job.update(status="funded", error=None)
+            self.funded += 1
+            self.time_to_funded.record((time.time() - job["enqueued_at"]) * 1000)
+            logger.info(f"Funded wallet {wallet_id}")
+        except Exception as e:
+            job["attempts"] += 1
+            job["error"] = str(e)
+            if job["attempts"] >= FUNDING_MAX_ATTEMPTS:
+                job["status"] = "failed"
+                self.failed += 1
+                logger.error(f"Giving up funding wallet {wallet_id}: {e}")
+            else:
+                job["next_attempt_at"] = time.time() + FUNDING_RETRY_DELAY * 2 ** (job["attempts"] - 1)
+                self.retries += 1
+                logger.warning(f"Funding wallet {wallet_id} failed (attempt {job['attempts']}): {e}")
+        finally:
+            if job["status"] == "pending":
+                await self._run_blocking(shared_store.set, self.NAMESPACE, wallet_id, job)
+            else:
+                # Written before the pending job is removed, so status never reads unknown
+                await self._run_blocking(shared_store.set, self.FINISHED_NAMESPACE, wallet_id, job, FUNDING_RECORD_TTL)
+                await self._run_blocking(shared_store.delete, self.NAMESPACE, wallet_id)
+            await self._run_blocking(shared_store.delete, "funding_lease", wallet_id)
+        return True
+
+    async def run(self):
+        """Run due jobs, FUNDING_CONCURRENCY at a time, for the life of the process.
+
+        Also sweeps expired shared-store rows (finished jobs, leases, caches)
+        every SHARED_STORE_PURGE_INTERVAL, since reads only skip them.
+        """
+        if self._wake is None:
+            self._wake = asyncio.Event()
+        next_purge = time.monotonic()
+        while True:
+            self._wake.clear()
+            backlog = False
+            if time.monotonic() >= next_purge:
+                next_purge = time.monotonic() + SHARED_STORE_PURGE_INTERVAL
+                try:
+                    purged = await self._run_blocking(shared_store.purge_expired)
+                    if purged:
+                        logger.info(f"Purged {purged} expired shared store rows")
+                except Exception as e:
+                    logger.warning(f"Shared store purge failed: {e}")
+            try:
+                jobs = await self._run_blocking(shared_store.items, self.NAMESPACE)
+                leased = {key for key, _ in await self._run_blocking(shared_store.items, "funding_lease")}
+                now = time.time()
+                due = [(key, job) for key, job in jobs
+                       if job["status"] == "pending" and job["next_attempt_at"] <= now and key not in leased]
+                ran = await asyncio.gather(*[self._process(key, job) for key, job in due[:FUNDING_CONCURRENCY]])
+                # Go straight to the next batch only if this one made progress;
+                # otherwise other workers hold the leases and polling is enough
+                backlog = len(due) > FUNDING_CONCURRENCY and any(ran)
+            except Exception as e:
+                logger.warning(f"Funding queue pass failed: {e}")
+            if backlog:
+                continue
+            try:
+                await asyncio.wait_for(self._wake.wait(), FUNDING_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "worker_running": self._worker is not None and not self._worker.done(),
+            "enqueued": self.enqueued,
+            "funded": self.funded,
+            "failed": self.failed,
+            "retries": self.retries,
+            "time_to_funded": self.time_to_funded.snapshot()
+        }
@@ -4,12 +4,12 @@ import logging
 logger = logging.getLogger(__name__)
 class MorphoDepositCapability(CDPCapability):
     """Deposit into a Morpho Vault"""
+    pool_size = 4
     async def execute(self, agent_name: str, thread_id: str,
                      amount: float, asset_id: str) -> Dict[str, Any]:
-        wallet = await self.wallet_manager.get_or_create_wallet(agent_name, thread_id)
+        wallet = await self.funded_wallet(agent_name, thread_id)
         try:
-            transaction = wallet.morpho_deposit(amount, asset_id)
-            result = transaction.wait()
+            result = await self.run_blocking(lambda: wallet.morpho_deposit(amount, asset_id).wait())
             return {
                 "status": "success",
                 "transaction_hash": result.transaction_hash,
@@ -22,12 +22,12 @@ class MorphoDepositCapability(CDPCapability):
 
 class MorphoWithdrawCapability(CDPCapability):
     """Withdraw from a Morpho Vault"""
+    pool_size = 4
     async def execute(self, agent_name: str, thread_id: str,
                      amount: float, asset_id: str) -> Dict[str, Any]:
-        wallet = await self.wallet_manager.get_or_create_wallet(agent_name, thread_id)
+        wallet = await self.funded_wallet(agent_name, thread_id)
         try:
-            transaction = wallet.morpho_withdraw(amount, asset_id)
-            result = transaction.wait()
+            result = await self.run_blocking(lambda: wallet.morpho_withdraw(amount, asset_id).wait())
             return {
                 "status": "success",
                 "transaction_hash": result.transaction_hash,
@@ -11,7 +11,7 @@ class NFTBalanceCapability(CDPCapability):
                      contract_address: str, token_id: Optional[int] = None) -> Dict[str, Any]:
         wallet = await self.wallet_manager.get_or_create_wallet(agent_name, thread_id)
         try:
-            balance = wallet.balance_nft(contract_address, token_id)
+            balance = await self.run_blocking(wallet.balance_nft, contract_address, token_id)
             return {
                 "status": "success",
                 "balance": balance,
@@ -24,12 +24,12 @@ class NFTBalanceCapability(CDPCapability):
 
 class DeployNFTCapability(CDPCapability):
     """Deploy new NFT contracts"""
+    pool_size = 2
     async def execute(self, agent_name: str, thread_id: str,
                      name: str, symbol: str, base_uri: str) -> Dict[str, Any]:
-        wallet = await self.wallet_manager.get_or_create_wallet(agent_name, thread_id)
+        wallet = await self.funded_wallet(agent_name, thread_id)
         try:
-            contract = wallet.deploy_nft(name, symbol, base_uri)
-            result = contract.wait()
+            result = await self.run_blocking(lambda: wallet.deploy_nft(name, symbol, base_uri).wait())
             return {
                 "status": "success",
                 "contract_address": result.contract_address,
@@ -42,12 +42,12 @@ class DeployNFTCapability(CDPCapability):
 
 class MintNFTCapability(CDPCapability):
     """Mint NFTs from existing contracts"""
+    pool_size = 4
     async def execute(self, agent_name: str, thread_id: str,
                      contract_address: str, token_uri: str) -> Dict[str, Any]:
-        wallet = await self.wallet_manager.get_or_create_wallet(agent_name, thread_id)
+        wallet = await self.funded_wallet(agent_name, thread_id)
         try:
-            transaction = wallet.mint_nft(contract_address, token_uri)
-            result = transaction.wait()
+            result = await self.run_blocking(lambda: wallet.mint_nft(contract_address, token_uri).wait())
             return {
                 "status": "success",
                 "transaction_hash": result.transaction_hash,
@@ -60,13 +60,15 @@ class MintNFTCapability(CDPCapability):
 
 class TransferNFTCapability(CDPCapability):
     """Transfer an NFT (ERC-721)"""
+    pool_size = 4
     async def execute(self, agent_name: str, thread_id: str,
                      contract_address: str, token_id: int,
                      to_address: str) -> Dict[str, Any]:
-        wallet = await self.wallet_manager.get_or_create_wallet(agent_name, thread_id)
+        wallet = await self.funded_wallet(agent_name, thread_id)
         try:
-            transaction = wallet.transfer_nft(contract_address, token_id, to_address)
-            result = transaction.wait()
+            result = await self.run_blocking(
+                lambda: wallet.transfer_nft(contract_address, token_id, to_address).wait()
+            )
             return {
                 "status": "success",
                 "transaction_hash": result.transaction_hash,
@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+PrefetchKey = Tuple[str, str, str, Tuple[Tuple[str, Any], ...]]
+
+class PrefetchCache:
+    """Capability results started ahead of time for one request"""
+
+    def __init__(self):
+        self.tasks: Dict[PrefetchKey, asyncio.Task] = {}
+        self.used: set = set()
+
+    @staticmethod
+    def key(capability_name: str, agent_name: str, thread_id: str, kwargs: Dict[str, Any]) -> PrefetchKey:
+        return (capability_name, agent_name, thread_id, tuple(sorted(kwargs.items())))
+
+    def start(self, key: PrefetchKey, coro) -> asyncio.Task:
+        task = self.tasks[key] = asyncio.ensure_future(coro)
+        prefetch_stats.started += 1
+        return task
+
+    def take(self, key: PrefetchKey) -> Optional[asyncio.Task]:
+        task = self.tasks.get(key)
+        if task is not None:
+            self.used.add(key)
+        return task
+
+    def close(self):
+        """Cancel prefetches the request never asked for"""
+        for key, task in self.tasks.items():
+            if key not in self.used:
+                prefetch_stats.wasted += 1
+                task.cancel()
+
+class PrefetchStats:
+    def __init__(self):
+        self.requests = 0
+        self.started = 0
+        self.hits = 0
+        self.wasted = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "started": self.started,
+            "hits": self.hits,
+            "wasted": self.wasted
+        }
+
+prefetch_stats = PrefetchStats()
+metrics.register("capability_prefetch", prefetch_stats.snapshot)
+
+_prefetch_cache: ContextVar[Optional[PrefetchCache]] = ContextVar("capability_prefetch", default=None)
+
+def lookup(capability_name: str, agent_name: str, thread_id: str,
+           kwargs: Dict[str, Any]) -> Optional[asyncio.Task]:
+    """The prefetched result of this exact call in the current request, if any"""
+    cache = _prefetch_cache.get()
+    if cache is None:
+        return None
+    task = cache.take(PrefetchCache.key(capability_name, agent_name, thread_id, kwargs))
+    if task is not None:
+        prefetch_stats.hits += 1
+    return task
+
+def detect_assets(message: str, aliases: Dict[str, str]) -> List[str]:
+    """Standard symbols of the assets a message mentions, by whole-word alias match"""
+    words = set(re.findall(r"[a-z0-9]+", message.lower()))
+    assets = []
+    for alias, symbol in aliases.items():
+        if alias in words and symbol not in assets:
+            assets.append(symbol)
+    return assets
+
+async def _prefetch_price(cache: PrefetchCache, agent, agent_name: str, thread_id: str, symbol: str):
+    """Look up the feed ID, then start the price fetch before handing the ID back,
+    so the agent finds the price already in flight when it asks for it"""
+    feed = await agent.capabilities["PythPriceFeedIDCapability"].execute(agent_name, thread_id, symbol=symbol)
+    if feed.get("status") == "success" and "PythPriceCapability" in agent.capabilities:
+        kwargs = {"price_feed_id": feed["feed_id"]}
+        cache.start(
+            PrefetchCache.key("PythPriceCapability", agent_name, thread_id, kwargs),
+            agent.capabilities["PythPriceCapability"].execute(agent_name, thread_id, **kwargs)
+        )
+    return feed
+
+def _wallet_is_cached(capability, agent_name: str, thread_id: str) -> bool:
+    """Whether the agent's wallet is already hydrated, so a balance lookup cannot create one"""
+    wallet_manager = getattr(capability, "wallet_manager", None)
+    if wallet_manager is None:
+        return False
+    return wallet_manager.wallet_cache.peek((agent_name, thread_id, "base-sepolia")) is not None
+
+@contextmanager
+def prefetch_capabilities(agent, thread_id: str, message: str) -> Iterator[None]:
+    """Speculatively start price and balance lookups for the assets a message mentions.
+
+    Uses the agent's own alias map (tracked_assets or common_assets) and only
+    read-only capabilities the agent has. Balances are only prefetched for a
+    wallet that is already cached; speculating on a new thread would create
+    and fund a wallet the agent may never use. execute_capability picks the
+    results up from the request-scoped cache; unused ones are cancelled
+    when the request finishes.
+    """
+    aliases = getattr(agent, "tracked_assets", None) or getattr(agent, "common_assets", None)
+    capabilities = getattr(agent, "capabilities", None)
+    if not aliases or not capabilities:
+        yield
+        return
+    assets = detect_assets(message, aliases)
+    if not assets:
+        yield
+        return
+
+    cache = PrefetchCache()
+    agent_name = agent.config.name
+    prefetch_stats.requests += 1
+    for symbol in assets:
+        if "PythPriceFeedIDCapability" in capabilities:
+            cache.start(
+                PrefetchCache.key("PythPriceFeedIDCapability", agent_name, thread_id, {"symbol": symbol}),
+                _prefetch_price(cache, agent, agent_name, thread_id, symbol)
+            )
+        if "BalanceCapability" in capabilities and _wallet_is_cached(capabilities["BalanceCapability"], agent_name, thread_id):
+            kwargs = {"asset_id": symbol}
+            cache.start(
+                PrefetchCache.key("BalanceCapability", agent_name, thread_id, kwargs),
+                capabilities["BalanceCapability"].execute(agent_name, thread_id, **kwargs)
+            )
+    token = _prefetch_cache.set(cache)
+    try:
+        yield
+    finally:
+        _prefetch_cache.reset(token)
+        cache.close()
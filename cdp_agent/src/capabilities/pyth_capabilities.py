@@ -1,20 +1,30 @@
 ### src/capabilities/pyth_capabilities.py ###
+import os
 import requests
 from typing import Dict, Any
+from src.storage.shared_store import shared_store
 from .cdp_base import CDPCapability
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Feed IDs are stable, so lookups are shared by all workers for a day by default
+FEED_ID_CACHE_TTL = float(os.getenv("PYTH_FEED_ID_CACHE_TTL", "86400"))
+
 class PythPriceFeedIDCapability(CDPCapability):
     """Get Pyth Network price feed ID for a token"""
+    pool_size = 16
     
     async def execute(self, agent_name: str, thread_id: str, 
                      symbol: str) -> Dict[str, Any]:
         """Get price feed ID for given token symbol"""
         try:
+            cached_feed_id = await self.run_blocking(shared_store.get, "pyth_feed_ids", symbol.lower())
+            if cached_feed_id:
+                return {"status": "success", "feed_id": cached_feed_id, "symbol": symbol}
+
             url = f"https://hermes.pyth.network/v2/price_feeds?query={symbol}&asset_type=crypto"
-            response = requests.get(url)
+            response = await self.run_blocking(requests.get, url)
             response.raise_for_status()
             data = response.json()
             
@@ -34,10 +44,14 @@ class PythPriceFeedIDCapability(CDPCapability):
                     "status": "error",
                     "error": f"No price feed found for {symbol}"
                 }
-                
+
+            feed_id = filtered_data[0]["id"]
+            await self.run_blocking(
+                shared_store.set, "pyth_feed_ids", symbol.lower(), feed_id, FEED_ID_CACHE_TTL
+            )
             return {
                 "status": "success",
-                "feed_id": filtered_data[0]["id"],
+                "feed_id": feed_id,
                 "symbol": symbol
             }
                 
@@ -47,6 +61,7 @@ class PythPriceFeedIDCapability(CDPCapability):
 
 class PythPriceCapability(CDPCapability):
     """Get price data from Pyth Network"""
+    pool_size = 16
     
     def _format_price(self, price: int, exponent: int) -> str:
         """Format price with proper decimal places"""
@@ -64,7 +79,7 @@ class PythPriceCapability(CDPCapability):
         """Get price data for given feed ID"""
         try:
             url = f"https://hermes.pyth.network/v2/updates/price/latest?ids[]={price_feed_id}"
-            response = requests.get(url)
+            response = await self.run_blocking(requests.get, url)
             response.raise_for_status()
             data = response.json()
             
@@ -4,12 +4,14 @@ import logging
 logger = logging.getLogger(__name__)
 class DeployTokenCapability(CDPCapability):
     """Deploy ERC-20 token contracts"""
+    pool_size = 2
     async def execute(self, agent_name: str, thread_id: str,
                      name: str, symbol: str, initial_supply: int) -> Dict[str, Any]:
         try:
-            wallet = await self.wallet_manager.get_or_create_wallet(agent_name, thread_id)
-            contract = wallet.deploy_token(name, symbol, initial_supply)
-            result = contract.wait()
+            wallet = await self.funded_wallet(agent_name, thread_id)
+            result = await self.run_blocking(
+                lambda: wallet.deploy_token(name, symbol, initial_supply).wait()
+            )
             return {
                 "status": "success",
                 "contract_address": result.contract_address,
@@ -0,0 +1,98 @@
+import asyncio
+import inspect
+import json
+import re
+from typing import Any, Dict, List, Optional, Type
+from langchain_core.messages import ToolMessage
+from pydantic import BaseModel, create_model
+from .cdp_base import CDPCapability
+from .agent_mixins import CDPAgentMixin
+
+# Capabilities that only read state; an agent whose tools are all in here
+# can still share executions between identical requests
+READ_ONLY_CAPABILITIES = {
+    "BalanceCapability",
+    "NFTBalanceCapability",
+    "PythPriceCapability",
+    "PythPriceFeedIDCapability",
+    "WalletDetailsCapability",
+}
+
+def capability_classes() -> Dict[str, Type[CDPCapability]]:
+    """Every imported CDPCapability subclass by class name"""
+    classes: Dict[str, Type[CDPCapability]] = {}
+    pending = list(CDPCapability.__subclasses__())
+    while pending:
+        cls = pending.pop(0)
+        classes.setdefault(cls.__name__, cls)
+        pending.extend(cls.__subclasses__())
+    return classes
+
+def tool_name(capability_class: Type[CDPCapability]) -> str:
+    """PythPriceFeedIDCapability -> pyth_price_feed_id"""
+    name = capability_class.__name__.removesuffix("Capability")
+    return re.sub(r"(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])", "_", name).lower()
+
+def args_schema(capability_class: Type[CDPCapability]) -> Type[BaseModel]:
+    """Arguments model built from the signature of the capability's execute()"""
+    fields: Dict[str, Any] = {}
+    for name, param in inspect.signature(capability_class.execute).parameters.items():
+        if name in ("self", "agent_name", "thread_id") or param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+            continue
+        annotation = Any if param.annotation is param.empty else param.annotation
+        if param.default is param.empty:
+            fields[name] = (annotation, ...)
+        else:
+            if param.default is None:
+                annotation = Optional[annotation]
+            fields[name] = (annotation, param.default)
+    return create_model(f"{capability_class.__name__}Args", **fields)
+
+def tool_definition(capability_class: Type[CDPCapability]) -> Dict[str, Any]:
+    """OpenAI function-tool definition for bind_tools"""
+    return {
+        "type": "function",
+        "function": {
+            "name": tool_name(capability_class),
+            "description": (capability_class.__doc__ or capability_class.__name__).strip(),
+            "parameters": args_schema(capability_class).model_json_schema()
+        }
+    }
+
+class CapabilityToolkit:
+    """A set of CDP capabilities exposed to the LLM as tools.
+
+    Tool calls from one model turn run concurrently, each through
+    CDPAgentMixin.execute_capability so they emit the usual capability
+    events and use the shared capability instances.
+    """
+
+    def __init__(self, capability_names: List[str]):
+        available = capability_classes()
+        unknown = [name for name in capability_names if name not in available]
+        if unknown:
+            raise ValueError(f"Unknown capabilities: {', '.join(unknown)}")
+        classes = [available[name] for name in capability_names]
+        self.mixin = CDPAgentMixin(classes)
+        self.capability_by_tool = {tool_name(cls): cls.__name__ for cls in classes}
+        self.definitions = [tool_definition(cls) for cls in classes]
+        self.read_only = all(name in READ_ONLY_CAPABILITIES for name in capability_names)
+
+    async def _run_call(self, tool_call: Dict[str, Any], agent_name: str, thread_id: str) -> ToolMessage:
+        capability_name = self.capability_by_tool.get(tool_call["name"])
+        if capability_name is None:
+            result = {"status": "error", "error": f"Unknown tool {tool_call['name']}"}
+        else:
+            try:
+                result = await self.mixin.execute_capability(
+                    capability_name, agent_name, thread_id, **tool_call["args"]
+                )
+            except Exception as e:
+                result = {"status": "error", "error": str(e)}
+        return ToolMessage(content=json.dumps(result, default=str), tool_call_id=tool_call["id"])
+
+    async def run(self, tool_calls: List[Dict[str, Any]], agent_name: str, thread_id: str) -> List[ToolMessage]:
+        """Run one turn's tool calls concurrently; results are in call order"""
+        return list(await asyncio.gather(*[
+            self._run_call(tool_call, agent_name, thread_id) for tool_call in tool_calls
+        ]))
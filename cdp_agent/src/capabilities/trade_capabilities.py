@@ -7,6 +7,7 @@ logger = logging.getLogger(__name__)
 
 class TradeCapability(CDPCapability):
     """Execute and analyze trades"""
+    pool_size = 4
     
     async def execute(self, agent_name: str, thread_id: str,
                      amount: float = None, asset_id: str = None,
@@ -16,9 +17,9 @@ class TradeCapability(CDPCapability):
             wallet = await self.wallet_manager.get_or_create_wallet(agent_name, thread_id)
             
             if amount and from_asset and to_asset:
-                # Execute a trade
-                trade = wallet.trade(amount, from_asset, to_asset)
-                result = trade.wait()
+                # Execute a trade, once the wallet has its faucet funds
+                await self.wait_for_funding(wallet)
+                result = await self.run_blocking(lambda: wallet.trade(amount, from_asset, to_asset).wait())
                 return {
                     "status": "success",
                     "transaction_hash": result.transaction_hash,
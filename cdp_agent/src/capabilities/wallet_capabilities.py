@@ -11,7 +11,8 @@ class WalletDetailsCapability(CDPCapability):
                 "status": "success",
                 "wallet_id": wallet.id,
                 "address": wallet.default_address.address_id,
-                "network": wallet.network_id
+                "network": wallet.network_id,
+                "funding_status": await self.wallet_manager.funding_status(wallet)
             }
         except Exception as e:
             logger.error(f"Wallet details fetch failed: {e}")
@@ -19,12 +20,12 @@ class WalletDetailsCapability(CDPCapability):
 
 class RegisterBasenameCapability(CDPCapability):
     """Register a Basename for the wallet"""
+    pool_size = 2
     async def execute(self, agent_name: str, thread_id: str,
                      basename: str) -> Dict[str, Any]:
-        wallet = await self.wallet_manager.get_or_create_wallet(agent_name, thread_id)
+        wallet = await self.funded_wallet(agent_name, thread_id)
         try:
-            transaction = wallet.register_basename(basename)
-            result = transaction.wait()
+            result = await self.run_blocking(lambda: wallet.register_basename(basename).wait())
             return {
                 "status": "success",
                 "transaction_hash": result.transaction_hash,
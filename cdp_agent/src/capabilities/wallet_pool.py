@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import os
+from typing import Any, Dict, List, Optional
+from cdp import Wallet
+from src.storage.shared_store import shared_store
+
+logger = logging.getLogger(__name__)
+
+# Created and funded wallets kept ready per network; 0 disables the pool
+WALLET_POOL_SIZE = int(os.getenv("WALLET_POOL_SIZE", "0"))
+WALLET_POOL_NETWORKS = [n.strip() for n in os.getenv("WALLET_POOL_NETWORKS", "base-sepolia").split(",") if n.strip()]
+# Seconds between refill checks when no wallet has been claimed
+WALLET_POOL_REFILL_INTERVAL = float(os.getenv("WALLET_POOL_REFILL_INTERVAL", "60"))
+
+class WalletPool:
+    """Pre-created, pre-funded wallets that new (agent, thread) pairs claim.
+
+    Pooled wallets are stored in the vault like assigned ones, under
+    VAULT_AGENT_NAME; the shared store only lists their IDs, so every
+    worker on the host draws from one pool and a claim is atomic.
+    Refilling runs in the background; a lease in the shared store keeps
+    workers from refilling the same network at once.
+    """
+
+    # Vault agent name for wallets not yet claimed; the thread ID is the network
+    VAULT_AGENT_NAME = "wallet_pool"
+
+    def __init__(self, wallet_manager, size: int = WALLET_POOL_SIZE, networks: List[str] = WALLET_POOL_NETWORKS):
+        self.wallet_manager = wallet_manager
+        self.size = size
+        self.networks = networks
+        self._wake = asyncio.Event()
+        self.claimed = 0
+        self.empty_claims = 0
+        self.released = 0
+        self.created = 0
+        self.failures = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0
+
+    @staticmethod
+    def _namespace(network_id: str) -> str:
+        return f"wallet_pool:{network_id}"
+
+    async def claim(self, network_id: str) -> Optional[Dict[str, Any]]:
+        """Take a ready wallet handle for this network, or None if the pool is empty"""
+        if not self.enabled or network_id not in self.networks:
+            return None
+        handle = await self.wallet_manager._run_blocking(shared_store.pop, self._namespace(network_id))
+        if handle is None:
+            self.empty_claims += 1
+        else:
+            self.claimed += 1
+        self._wake.set()
+        return handle
+
+    async def release(self, handle: Dict[str, Any]):
+        """Put back a claimed wallet that could not be assigned; it is still funded"""
+        await self.wallet_manager._run_blocking(
+            shared_store.set, self._namespace(handle["network_id"]), handle["wallet_id"], handle
+        )
+        self.claimed -= 1
+        self.released += 1
+
+    def _provision_blocking(self, network_id: str) -> Dict[str, Any]:
+        """Create, fund and vault one wallet (blocking).
+
+        Raises if either faucet request fails, so only wallets whose funding
+        confirmed are pooled; claimed pool wallets are never queued for funding.
+        """
+        manager = self.wallet_manager
+        wallet = Wallet.create(network_id=network_id)
+        manager.funding_queue.fund_wallet_blocking(wallet)
+        wallet_data = {"wallet_id": wallet.id, "network_id": network_id}
+        if not manager.vault.store_wallet(manager.node_id, self.VAULT_AGENT_NAME, network_id,
+                                          wallet_data, wallet._seed, manager.schema_id):
+            raise Exception("Failed to store pooled wallet in Nillion vault")
+        return manager._make_wallet_handle(wallet.id, network_id)
+
+    async def refill(self, network_id: str):
+        namespace = self._namespace(network_id)
+        lease_ttl = WALLET_POOL_REFILL_INTERVAL * 10
+        if not await self.wallet_manager._run_blocking(shared_store.add, "wallet_pool_refill", network_id, os.getpid(), lease_ttl):
+            return  # another worker is refilling this network
+        try:
+            while await self.wallet_manager._run_blocking(shared_store.count, namespace) < self.size:
+                handle = await self.wallet_manager._run_blocking(self._provision_blocking, network_id)
+                await self.wallet_manager._run_blocking(shared_store.set, namespace, handle["wallet_id"], handle)
+                self.created += 1
+                logger.info(f"Added wallet {handle['wallet_id']} to the {network_id} pool")
+        finally:
+            await self.wallet_manager._run_blocking(shared_store.delete, "wallet_pool_refill", network_id)
+
+    async def run(self):
+        """Keep every pooled network topped up; runs for the life of the process"""
+        while True:
+            self._wake.clear()
+            for network_id in self.networks:
+                try:
+                    await self.refill(network_id)
+                except Exception as e:
+                    self.failures += 1
+                    logger.warning(f"Wallet pool refill for {network_id} failed: {e}")
+            try:
+                await asyncio.wait_for(self._wake.wait(), WALLET_POOL_REFILL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "target_size": self.size,
+            "available": {n: shared_store.count(self._namespace(n)) for n in self.networks} if self.enabled else {},
+            "claimed": self.claimed,
+            "empty_claims": self.empty_claims,
+            "released": self.released,
+            "created": self.created,
+            "refill_failures": self.failures
+        }
@@ -4,12 +4,12 @@ import logging
 logger = logging.getLogger(__name__)
 class WowCreateTokenCapability(CDPCapability):
     """Deploy a token using Zora's Wow Launcher"""
+    pool_size = 2
     async def execute(self, agent_name: str, thread_id: str,
                      name: str, symbol: str) -> Dict[str, Any]:
-        wallet = await self.wallet_manager.get_or_create_wallet(agent_name, thread_id)
+        wallet = await self.funded_wallet(agent_name, thread_id)
         try:
-            transaction = wallet.wow_create_token(name, symbol)
-            result = transaction.wait()
+            result = await self.run_blocking(lambda: wallet.wow_create_token(name, symbol).wait())
             return {
                 "status": "success",
                 "transaction_hash": result.transaction_hash,
@@ -22,12 +22,12 @@ class WowCreateTokenCapability(CDPCapability):
 
 class WowBuyTokenCapability(CDPCapability):
     """Buy Zora Wow ERC-20 memecoin with ETH"""
+    pool_size = 4
     async def execute(self, agent_name: str, thread_id: str,
                      token_address: str, eth_amount: float) -> Dict[str, Any]:
-        wallet = await self.wallet_manager.get_or_create_wallet(agent_name, thread_id)
+        wallet = await self.funded_wallet(agent_name, thread_id)
         try:
-            transaction = wallet.wow_buy_token(token_address, eth_amount)
-            result = transaction.wait()
+            result = await self.run_blocking(lambda: wallet.wow_buy_token(token_address, eth_amount).wait())
             return {
                 "status": "success",
                 "transaction_hash": result.transaction_hash,
@@ -40,12 +40,12 @@ class WowBuyTokenCapability(CDPCapability):
 
 class WowSellTokenCapability(CDPCapability):
     """Sell Zora Wow ERC-20 memecoin for ETH"""
+    pool_size = 4
     async def execute(self, agent_name: str, thread_id: str,
                      token_address: str, token_amount: float) -> Dict[str, Any]:
-        wallet = await self.wallet_manager.get_or_create_wallet(agent_name, thread_id)
+        wallet = await self.funded_wallet(agent_name, thread_id)
         try:
-            transaction = wallet.wow_sell_token(token_address, token_amount)
-            result = transaction.wait()
+            result = await self.run_blocking(lambda: wallet.wow_sell_token(token_address, token_amount).wait())
             return {
                 "status": "success",
                 "transaction_hash": result.transaction_hash,
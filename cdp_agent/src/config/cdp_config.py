@@ -37,8 +37,28 @@ def validate_credentials():
         return False
     return True
 
+def validate_private_key(private_key: str) -> bool:
+    """Check offline that the CDP private key is a loadable PEM key"""
+    try:
+        from cryptography.hazmat.primitives.serialization import load_pem_private_key
+        load_pem_private_key(private_key.replace('\\n', '\n').encode(), password=None)
+        return True
+    except Exception as e:
+        logger.error(f"CDP private key could not be parsed: {e}")
+        return False
+
+_cdp_configured = False
+
 def initialize_cdp():
-    """Initialize CDP SDK with enhanced error handling"""
+    """Initialize CDP SDK with enhanced error handling.
+
+    Only offline checks run here; the live API probe runs in the background
+    (see config.cdp_health) so that booting costs no network round-trips.
+    """
+    global _cdp_configured
+    if _cdp_configured:
+        return True
+
     try:
         # Load environment variables
         if not load_env_file():
@@ -51,20 +71,14 @@ def initialize_cdp():
         # Get credentials
         api_key_name = os.getenv('CDP_API_KEY_NAME')
         private_key = os.getenv('CDP_API_KEY_PRIVATE_KEY')
+        if not validate_private_key(private_key):
+            raise ValueError("CDP_API_KEY_PRIVATE_KEY is not a valid PEM private key")
+
         # Configure CDP
         Cdp.configure(api_key_name, private_key)
+        _cdp_configured = True
         logger.info("CDP SDK initialized successfully")
-        
-        # Verify configuration worked
-        try:
-            # Simple test operation
-            from cdp import Wallet
-            test_wallet = Wallet.create()
-            logger.info("CDP configuration verified - test wallet creation successful")
-            return True
-        except Exception as e:
-            logger.error(f"CDP configuration verification failed: {e}")
-            raise ValueError("CDP configuration verification failed")
+        return True
             
     except Exception as e:
         logger.error(f"Failed to initialize CDP SDK: {str(e)}")
@@ -0,0 +1,95 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+from cdp import Wallet
+
+logger = logging.getLogger(__name__)
+
+VERIFICATION_FILE = "data/cdp_verification.json"
+# How long a successful remote check is trusted across restarts
+VERIFICATION_TTL = int(os.getenv("CDP_VERIFICATION_TTL", "21600"))
+# How often the background probe re-checks the API while the server runs
+PROBE_INTERVAL = int(os.getenv("CDP_PROBE_INTERVAL", "900"))
+
+class CDPHealthMonitor:
+    """Tracks whether the CDP API accepts our credentials.
+
+    The last successful probe is persisted with a TTL so restarts can trust it
+    without calling the API. The live probe runs as a background task.
+    """
+
+    def __init__(self, path: str = VERIFICATION_FILE, ttl: int = VERIFICATION_TTL,
+                 interval: int = PROBE_INTERVAL):
+        self.path = path
+        self.ttl = ttl
+        self.interval = interval
+        self.state: Dict[str, Any] = {"status": "unknown", "checked_at": None, "source": None}
+
+    def _key_fingerprint(self) -> str:
+        """Fingerprint of the API key so a rotated key invalidates the cached result"""
+        return hashlib.sha256(os.getenv("CDP_API_KEY_NAME", "").encode()).hexdigest()
+
+    def load_cached(self) -> bool:
+        """Adopt the persisted verification result if it is still fresh"""
+        try:
+            if not os.path.exists(self.path):
+                return False
+            with open(self.path, 'r') as f:
+                cached = json.load(f)
+            if cached.get("key") != self._key_fingerprint():
+                return False
+            if time.time() - cached.get("checked_at", 0) > self.ttl:
+                return False
+            self.state = {"status": "ok", "checked_at": cached["checked_at"], "source": "cache"}
+            return True
+        except Exception as e:
+            logger.warning(f"Could not read CDP verification cache: {e}")
+            return False
+
+    def _persist(self, checked_at: float):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"key": self._key_fingerprint(), "checked_at": checked_at}, f)
+        os.replace(tmp_path, self.path)
+
+    def probe(self) -> Dict[str, Any]:
+        """Run one live, read-only API call (blocking)"""
+        started = time.time()
+        try:
+            # Listing wallets is read-only, unlike the old Wallet.create() check
+            next(iter(Wallet.list()), None)
+            self.state = {
+                "status": "ok",
+                "checked_at": started,
+                "latency_ms": round((time.time() - started) * 1000, 1),
+                "source": "probe"
+            }
+            self._persist(started)
+        except Exception as e:
+            logger.error(f"CDP health probe failed: {e}")
+            self.state = {"status": "error", "checked_at": started, "error": str(e), "source": "probe"}
+        return self.state
+
+    def snapshot(self) -> Dict[str, Any]:
+        state = dict(self.state)
+        checked_at: Optional[float] = state.get("checked_at")
+        if state["status"] == "ok" and checked_at and time.time() - checked_at > self.ttl:
+            state["status"] = "stale"
+        return state
+
+    async def run(self):
+        """Background loop feeding /health"""
+        if self.load_cached():
+            logger.info("Using cached CDP verification result")
+            # Defer the first live probe so a warm restart does no network work
+            await asyncio.sleep(self.interval)
+        while True:
+            await asyncio.to_thread(self.probe)
+            await asyncio.sleep(self.interval)
+
+cdp_health = CDPHealthMonitor()
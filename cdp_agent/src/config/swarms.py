@@ -0,0 +1,47 @@
+import os
+
+# AISwarmManager deployment (see blockend/ignition/deployments/chain-84532)
+SWARM_CONTRACT_ADDRESS = os.getenv("SWARM_CONTRACT_ADDRESS", "0x418EBcE67a27E56860258156565dB10269fcfD31")
+SWARM_RPC_URL = os.getenv("SWARM_RPC_URL", "https://sepolia.base.org")
+# Seconds a resolved swarm membership is reused before re-reading the chain
+SWARM_CACHE_TTL = float(os.getenv("SWARM_CACHE_TTL", "30"))
+
+# Only the view functions the API needs
+SWARM_MANAGER_ABI = [
+    {
+        "name": "getSwarmAgents",
+        "type": "function",
+        "stateMutability": "view",
+        "inputs": [{"name": "swarmId", "type": "uint256"}],
+        "outputs": [{"name": "", "type": "uint256[]"}]
+    },
+    {
+        "name": "getSwarmDetails",
+        "type": "function",
+        "stateMutability": "view",
+        "inputs": [{"name": "swarmId", "type": "uint256"}],
+        "outputs": [
+            {"name": "threadId", "type": "string"},
+            {"name": "agentCount", "type": "uint256"},
+            {"name": "createdAt", "type": "uint256"},
+            {"name": "status", "type": "uint8"},
+            {"name": "owner", "type": "address"}
+        ]
+    }
+]
+
+# On-chain agentId -> API agent id, mirrors `num` in web/config/agents.ts
+ONCHAIN_AGENT_IDS = {
+    1: "defi-accountant",
+    2: "defi-advisor",
+    3: "defi-degen",
+    4: "defi-risk-manager",
+    5: "god-god-agent",
+    6: "research-data-scientist",
+    7: "research-news-aggregator",
+    8: "research-pattern-detector",
+    9: "research-sentiment-analyzer",
+    10: "gov-proposal-analyzer",
+    11: "gov-vote-calculator",
+    12: "gov-strategy-coordinator",
+}
@@ -1,19 +1,43 @@
+import asyncio
+import logging
 import os
-from typing import Dict
+from typing import List, Optional
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
 from dotenv import load_dotenv
-from agents.base import BaseAgent, AgentRequest, AgentResponse
+from agents.base import AgentRequest, AgentResponse
+from agents.dispatch import (
+    BatchRequest, BatchResponse, execute_agent_request, get_admission_controller, run_agent_request,
+    run_batch
+)
+from agents.llm import llm_backend
+from agents.llm_hedge import LLMDeadlineExceeded
+from agents.prompts import prompt_registry
+from agents.registry import AgentRegistry
+from agents.streaming import stream_agent_response
+from agents.swarm import (
+    SwarmRequest, SwarmResponse, SwarmResolver, SwarmNotFoundError,
+    SwarmInactiveError, run_swarm
+)
+from capabilities.cdp_base import WalletManager
+from capabilities.wallet_pool import WALLET_POOL_SIZE
 from config.agents import AGENT_CONFIGS, AGENT_CLASSES
 from config.cdp_config import initialize_cdp
+from config.cdp_health import cdp_health
+from utils.admission import Overloaded
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
 
-# Initialize CDP before creating FastAPI app
+# Configure CDP before creating FastAPI app (offline checks only)
 initialize_cdp()
 # Load environment variables
 load_dotenv()
 
-# Validate OpenAI API key
-if not os.getenv('OPENAI_API_KEY'):
+# Validate OpenAI API key (not needed for the local fake backend)
+if llm_backend() != "fake" and not os.getenv('OPENAI_API_KEY'):
     raise ValueError("OPENAI_API_KEY environment variable is not set")
 
 app = FastAPI(title="Modular Multi-Agent Chat API")
@@ -27,29 +51,127 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize agents
-agents: Dict[str, BaseAgent] = {}
+# Agents are built lazily on first request and memoized
+agents = AgentRegistry(AGENT_CONFIGS, AGENT_CLASSES)
+swarm_resolver = SwarmResolver()
+
+class WarmupRequest(BaseModel):
+    agents: Optional[List[str]] = None
+
+@app.on_event("startup")
+async def start_cdp_health_probe():
+    """Verify CDP credentials against the live API without delaying startup"""
+    app.state.cdp_health_task = asyncio.create_task(cdp_health.run())
+
+@app.on_event("startup")
+async def compile_prompts():
+    """Compile agent prompts in the background; counting their tokens may
+    download the tiktoken encoding, which must not hold up boot"""
+    app.state.prompt_compile_task = asyncio.create_task(
+        asyncio.to_thread(prompt_registry.compile_all, AGENT_CONFIGS.values())
+    )
 
-for agent_id, config in AGENT_CONFIGS.items():
-    # Get the appropriate agent class
-    agent_class = AGENT_CLASSES.get(agent_id) or AGENT_CLASSES["default"]
-    agents[agent_id] = agent_class(config)
+@app.on_event("startup")
+async def start_wallet_workers():
+    """Resume queued faucet funding, and keep WALLET_POOL_SIZE funded wallets
+    ready per network for new threads"""
+    try:
+        wallet_manager = await asyncio.to_thread(WalletManager, "data/agent_wallets.json")
+    except Exception as e:
+        logger.warning(f"Wallet workers not started: {e}")
+        return
+    wallet_manager.funding_queue.ensure_worker()
+    if WALLET_POOL_SIZE > 0:
+        app.state.wallet_pool_task = asyncio.create_task(wallet_manager.wallet_pool.run())
+
+@app.on_event("startup")
+async def warmup_configured_agents():
+    """Pre-build the agents listed in AGENT_WARMUP (comma separated, or "all")"""
+    warmup = os.getenv("AGENT_WARMUP", "").strip()
+    if not warmup:
+        return
+    agent_ids = None if warmup == "all" else [a.strip() for a in warmup.split(",") if a.strip()]
+    await asyncio.to_thread(agents.warmup, agent_ids)
+
+@app.get("/health")
+async def health():
+    """Report server and CDP API health"""
+    cdp_state = cdp_health.snapshot()
+    return {
+        "status": "ok" if cdp_state["status"] == "ok" else "degraded",
+        "cdp": cdp_state,
+        "agents_loaded": agents.loaded()
+    }
+
+@app.get("/metrics")
+async def get_metrics():
+    """Runtime metrics (capability thread pools, ...)"""
+    return metrics.snapshot()
+
+@app.post("/admin/warmup")
+async def warmup_agents(request: WarmupRequest):
+    """Pre-build a chosen subset of agents (all agents when none are given)"""
+    results = await asyncio.to_thread(agents.warmup, request.agents)
+    return {"results": results, "loaded": agents.loaded()}
+
+@app.post("/batch", response_model=BatchResponse)
+async def batch(request: BatchRequest):
+    """Run many agent requests concurrently; per-item results are returned in order"""
+    return BatchResponse(results=await run_batch(agents, request.items, request.concurrency))
+
+@app.post("/swarm/{swarm_id}/{thread_id}", response_model=SwarmResponse)
+async def chat_with_swarm(swarm_id: int, thread_id: str, request: SwarmRequest):
+    """Send one message to every agent of an on-chain swarm in parallel"""
+    try:
+        return await run_swarm(agents, swarm_resolver, swarm_id, thread_id, request)
+    except SwarmNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except SwarmInactiveError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/{agent_id}/{thread_id}", response_model=AgentResponse)
 async def chat_with_agent(
     agent_id: str,
     thread_id: str,
-    request: AgentRequest
+    request: AgentRequest,
+    stream: bool = False
 ):
-    """Generic endpoint for chatting with any agent"""
+    """Generic endpoint for chatting with any agent.
+
+    With ?stream=true the reply is sent as Server-Sent Events: LLM tokens and
+    capability progress as they happen, then the final response.
+    """
     if agent_id not in agents:
         raise HTTPException(
             status_code=404,
-            detail=f"Agent '{agent_id}' not found. Available agents: {list(agents.keys())}"
+            detail=f"Agent '{agent_id}' not found. Available agents: {agents.available()}"
         )
-    
+
     try:
-        return await agents[agent_id].process(request, thread_id)
+        if stream:
+            agent = await agents.aget(agent_id)
+            # Reject before the 200 goes out; a full queue inside the stream
+            # could only be reported as an error event
+            get_admission_controller(agent, agent_id).check()
+            return StreamingResponse(
+                stream_agent_response(
+                    agent, thread_id,
+                    lambda: execute_agent_request(agent, agent_id, thread_id, request)
+                ),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+            )
+        return await run_agent_request(agents, agent_id, thread_id, request)
+    except Overloaded as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except LLMDeadlineExceeded as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -66,4 +188,9 @@ async def list_agents():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # Workers share wallet handles, the schema ID and caches through storage.shared_store
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    if workers > 1:
+        uvicorn.run("main:app", host="0.0.0.0", port=8000, workers=workers)
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -1,12 +1,16 @@
 import json
+import logging
 import uuid
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 from src.storage.config import NODE_CONFIG
 from src.storage.nildbapi import NilDBAPI
+from src.storage.shared_store import shared_store
 import nilql
 import os
 
+logger = logging.getLogger(__name__)
+
 # Initialize NilDB API
 nildb_api = NilDBAPI(NODE_CONFIG)
 
@@ -15,9 +19,15 @@ class WalletStorage:
     
     def __init__(self):
         self.schema_id = self._get_or_create_schema()
+        # A cluster key for secret-shared storage carries no secret material, so
+        # shares written by one worker decrypt with any other worker's key
         self.secret_key = nilql.ClusterKey.generate({'nodes': [{}] * len(NODE_CONFIG)}, {'store': True})
-    
+
     def _get_or_create_schema(self) -> str:
+        """Get the schema ID, creating the schema once per host if needed."""
+        return shared_store.get_or_create("nillion", "schema_id", self._create_schema)
+
+    def _create_schema(self) -> str:
         """Create schema if it does not exist."""
         SCHEMA_FILE_PATH = "data/nillion_schema_id.txt"
         
@@ -145,3 +155,43 @@ class WalletStorage:
         except Exception as e:
             print(f"Error retrieving wallet: {e}")
             return None
+
+    def get_wallet_by_id(self, node_name: str, wallet_id: str, schema: str) -> Optional[Dict[str, Any]]:
+        """Retrieve a wallet and decrypt its seed, looked up by CDP wallet ID."""
+        try:
+            records = nildb_api.data_read(node_name, schema, {"wallet_id": wallet_id})
+            if not records:
+                return None
+
+            record = records[0]
+            return {
+                "wallet_id": record["wallet_id"],
+                "network_id": record.get("network_id", ""),
+                "seed_data": self.decrypt_seed(json.loads(record["encrypted_seed"]))
+            }
+        except Exception as e:
+            logger.error(f"Error retrieving wallet {wallet_id}: {e}")
+            return None
+
+    def get_wallets_for_thread(self, node_name: str, thread_id: str, schema: str) -> Dict[str, Dict[str, Any]]:
+        """Retrieve every agent's wallet on a thread in one filtered read, keyed by agent name."""
+        try:
+            records = nildb_api.data_read(node_name, schema, {"thread_id": thread_id})
+        except Exception as e:
+            logger.error(f"Error retrieving wallets for thread {thread_id}: {e}")
+            return {}
+
+        wallets = {}
+        for record in records:
+            # Same record get_wallet would pick: the first one per agent
+            if record["agent_name"] in wallets:
+                continue
+            try:
+                wallets[record["agent_name"]] = {
+                    "wallet_id": record["wallet_id"],
+                    "network_id": record.get("network_id", ""),
+                    "seed_data": self.decrypt_seed(json.loads(record["encrypted_seed"]))
+                }
+            except Exception as e:
+                logger.error(f"Error decrypting wallet for {record.get('agent_name')}: {e}")
+        return wallets
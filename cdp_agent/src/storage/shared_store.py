@@ -0,0 +1,171 @@
+"""Host-local state shared by every uvicorn worker (SQLite in WAL mode)"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+SHARED_STORE_PATH = os.getenv("SHARED_STORE_PATH", "data/shared_store.db")
+
+class SharedStore:
+    """Namespaced key/value store with optional TTLs.
+
+    Every worker process opens the same database file, so wallet handles,
+    the Nillion schema ID and capability caches are created once per host
+    instead of once per worker. WAL mode lets readers proceed while a
+    writer holds the lock.
+    """
+
+    def __init__(self, path: str = SHARED_STORE_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def _initialize(self):
+        """Create the database file and table on first use rather than at import"""
+        with self._init_lock:
+            if self._initialized:
+                return
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            try:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS kv ("
+                    "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+                    "expires_at REAL, PRIMARY KEY (namespace, key))"
+                )
+            finally:
+                conn.close()
+            # The store holds wallet IDs and leases, not seeds, but keep it private
+            os.chmod(self.path, 0o600)
+            self._initialized = True
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread (sqlite3 connections are not thread-safe)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if not self._initialized:
+                self._initialize()
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _expiry(ttl: Optional[float]) -> Optional[float]:
+        return time.time() + ttl if ttl else None
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        row = self._connection().execute(
+            "SELECT value FROM kv WHERE namespace = ? AND key = ? "
+            "AND (expires_at IS NULL OR expires_at > ?)",
+            (namespace, key, time.time())
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None):
+        self._connection().execute(
+            "INSERT OR REPLACE INTO kv (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+            (namespace, key, json.dumps(value), self._expiry(ttl))
+        )
+
+    def add(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        """Store value only if the key is absent or expired; returns whether it was stored"""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "DELETE FROM kv WHERE namespace = ? AND key = ? AND expires_at <= ?",
+                (namespace, key, time.time())
+            )
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO kv (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (namespace, key, json.dumps(value), self._expiry(ttl))
+            )
+            conn.execute("COMMIT")
+            return cursor.rowcount == 1
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def delete(self, namespace: str, key: str):
+        self._connection().execute("DELETE FROM kv WHERE namespace = ? AND key = ?", (namespace, key))
+
+    def purge_expired(self) -> int:
+        """Delete every expired row; returns how many were removed"""
+        cursor = self._connection().execute("DELETE FROM kv WHERE expires_at <= ?", (time.time(),))
+        return cursor.rowcount
+
+    def items(self, namespace: str) -> List[Tuple[str, Any]]:
+        """Every live (key, value) in a namespace, oldest first"""
+        rows = self._connection().execute(
+            "SELECT key, value FROM kv WHERE namespace = ? "
+            "AND (expires_at IS NULL OR expires_at > ?) ORDER BY rowid",
+            (namespace, time.time())
+        ).fetchall()
+        return [(key, json.loads(value)) for key, value in rows]
+
+    def count(self, namespace: str) -> int:
+        row = self._connection().execute(
+            "SELECT COUNT(*) FROM kv WHERE namespace = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (namespace, time.time())
+        ).fetchone()
+        return row[0]
+
+    def pop(self, namespace: str) -> Optional[Any]:
+        """Atomically remove and return the oldest live value in a namespace, if any"""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT rowid, value FROM kv WHERE namespace = ? "
+                "AND (expires_at IS NULL OR expires_at > ?) ORDER BY rowid LIMIT 1",
+                (namespace, time.time())
+            ).fetchone()
+            if row:
+                conn.execute("DELETE FROM kv WHERE rowid = ?", (row[0],))
+            conn.execute("COMMIT")
+            return json.loads(row[1]) if row else None
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get_or_create(self, namespace: str, key: str, factory: Callable[[], Any],
+                      ttl: Optional[float] = None) -> Any:
+        """Return the stored value, or create it with factory() exactly once per host.
+
+        The write lock is held while factory runs, so concurrent workers wait
+        for the first one instead of each creating their own value.
+        """
+        value = self.get(namespace, key)
+        if value is not None:
+            return value
+
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT value FROM kv WHERE namespace = ? AND key = ? "
+                "AND (expires_at IS NULL OR expires_at > ?)",
+                (namespace, key, time.time())
+            ).fetchone()
+            if row:
+                conn.execute("COMMIT")
+                return json.loads(row[0])
+            value = factory()
+            conn.execute(
+                "INSERT OR REPLACE INTO kv (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (namespace, key, json.dumps(value), self._expiry(ttl))
+            )
+            conn.execute("COMMIT")
+            return value
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+shared_store = SharedStore()
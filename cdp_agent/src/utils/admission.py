@@ -0,0 +1,74 @@
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
+from utils.metrics import LatencyTracker
+
+class Overloaded(Exception):
+    """Raised when a request is rejected because the work queue is full"""
+
+    def __init__(self, name: str, retry_after: int):
+        super().__init__(f"{name} is overloaded, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+class AdmissionController:
+    """Bounded concurrency with a bounded wait queue.
+
+    Up to `max_concurrency` requests run at once and up to `max_queue_depth`
+    more wait for a slot; anything beyond that fails fast with Overloaded.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, max_queue_depth: int):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue_depth = max_queue_depth
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.active = 0
+        self.queued = 0
+        self.rejected = 0
+        self.wait = LatencyTracker()
+        self.service = LatencyTracker()
+
+    def retry_after(self) -> int:
+        """Seconds until the current queue is expected to drain"""
+        avg_ms = self.service.total_ms / self.service.count if self.service.count else 1000
+        return max(1, math.ceil(avg_ms / 1000 * (self.queued + 1) / self.max_concurrency))
+
+    def check(self):
+        """Raise Overloaded if a request arriving now would be rejected"""
+        if self._semaphore.locked() and self.queued >= self.max_queue_depth:
+            self.rejected += 1
+            raise Overloaded(self.name, self.retry_after())
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        self.check()
+
+        self.queued += 1
+        started = time.perf_counter()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+        admitted = time.perf_counter()
+        self.wait.record((admitted - started) * 1000)
+
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+            self.service.record((time.perf_counter() - admitted) * 1000)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue_depth": self.max_queue_depth,
+            "active": self.active,
+            "queue_depth": self.queued,
+            "rejected": self.rejected,
+            "wait": self.wait.snapshot(),
+            "service": self.service.snapshot()
+        }
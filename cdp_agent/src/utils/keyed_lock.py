@@ -0,0 +1,45 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Hashable, List
+from utils.metrics import LatencyTracker
+
+class KeyedLock:
+    """One FIFO asyncio lock per key, created on demand and dropped when idle.
+
+    Holders of the same key run one at a time in arrival order; different
+    keys never wait on each other.
+    """
+
+    def __init__(self):
+        # key -> [lock, number of holders and waiters]
+        self._locks: Dict[Hashable, List[Any]] = {}
+        self.wait = LatencyTracker()
+        self.contended = 0
+
+    @asynccontextmanager
+    async def acquire(self, key: Hashable) -> AsyncIterator[None]:
+        entry = self._locks.get(key)
+        if entry is None:
+            entry = self._locks[key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        lock = entry[0]
+        if lock.locked():
+            self.contended += 1
+        started = time.perf_counter()
+        try:
+            async with lock:
+                self.wait.record((time.perf_counter() - started) * 1000)
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._locks[key]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "active_keys": len(self._locks),
+            "waiting": sum(users - 1 for lock, users in self._locks.values() if lock.locked()),
+            "contended": self.contended,
+            "wait": self.wait.snapshot()
+        }
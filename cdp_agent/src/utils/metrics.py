@@ -0,0 +1,54 @@
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+class LatencyTracker:
+    """Rolling window of latency samples (milliseconds) with percentiles"""
+
+    def __init__(self, window: int = 1000):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_ms = 0.0
+
+    def record(self, latency_ms: float):
+        with self._lock:
+            self._samples.append(latency_ms)
+            self.count += 1
+            self.total_ms += latency_ms
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """pct in [0, 100]; None until a sample has been recorded"""
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def snapshot(self) -> Dict[str, Any]:
+        def rounded(value: Optional[float]) -> Optional[float]:
+            return round(value, 2) if value is not None else None
+
+        return {
+            "count": self.count,
+            "avg_ms": rounded(self.total_ms / self.count) if self.count else None,
+            "p50_ms": rounded(self.percentile(50)),
+            "p95_ms": rounded(self.percentile(95)),
+            "p99_ms": rounded(self.percentile(99))
+        }
+
+class MetricsRegistry:
+    """Process-wide registry of metric collectors, served by GET /metrics"""
+
+    def __init__(self):
+        self._collectors: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+    def register(self, name: str, collector: Callable[[], Dict[str, Any]]):
+        """Register a callable that returns the current metrics of one subsystem"""
+        self._collectors[name] = collector
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {name: collector() for name, collector in self._collectors.items()}
+
+metrics = MetricsRegistry()